@@ -1,7 +1,7 @@
 from smolagents import Tool, ToolCallingAgent
 from typing import Sequence
 from tools.calendar.check_events import check_events
-from tools.calendar.create_events import create_events
+from tools.calendar.create_events import create_events, create_events_bulk
 from tools.calendar.resolve_date_expression import resolve_date_expression
 from core.managed_prompts import load_agent_prompts
 
@@ -13,6 +13,7 @@ def calendar_agent(model: str) -> ToolCallingAgent:
         tools=[
             check_events,
             create_events,
+            create_events_bulk,
             resolve_date_expression
         ],
         name="calendar_agent",
@@ -20,6 +21,8 @@ def calendar_agent(model: str) -> ToolCallingAgent:
         instructions=prompts.system,
         add_base_tools=False,
         max_steps=3,
+        # Independent calls in one step (several ranges or events) overlap their HTTP waits
+        max_tool_threads=4,
     )
 
     return calendar_agent
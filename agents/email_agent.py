@@ -2,11 +2,12 @@ from smolagents import Tool, ToolCallingAgent
 from typing import Sequence
 from tools.email.check_mails import check_mails
 from core.managed_prompts import load_agent_prompts
+from core.single_tool_agent import SingleToolAgent
 
 prompts = load_agent_prompts("email_agent")
 
 def email_agent(model: str) -> ToolCallingAgent:
-    email_agent = ToolCallingAgent(
+    email_agent = SingleToolAgent(
         model=model,
         tools=[
             check_mails,
@@ -1,21 +1,25 @@
 from smolagents import Tool, ToolCallingAgent
 from typing import Sequence
-from tools.weather.check_weather import get_weather
+from tools.weather.check_weather import get_weather, get_weather_batch
 from core.managed_prompts import load_agent_prompts
+from core.single_tool_agent import SingleToolAgent
 
 prompts = load_agent_prompts("weather_agent")
 
 def weather_agent(model: str) -> ToolCallingAgent:
-    weather_agent = ToolCallingAgent(
+    weather_agent = SingleToolAgent(
         model=model,
         tools=[
             get_weather,
+            get_weather_batch,
         ],
         name="weather_agent",
         description=prompts.description,
         instructions=prompts.system,
         add_base_tools=False,
         max_steps=3,
+        # Several calls in one step overlap their geocode + forecast waits
+        max_tool_threads=4,
     )
 
     return weather_agent
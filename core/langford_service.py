@@ -1,12 +1,79 @@
 # core/langford_service.py
-from typing import Optional
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from typing import Iterator, Optional, Tuple
 from smolagents import ToolCallingAgent, LogLevel
+from smolagents.memory import ActionStep, FinalAnswerStep, ToolCall
 from core.llm import llm_object
 from core.managed_agents import build_agents
-from core.managed_prompts import load_agent_prompts
+from core.managed_prompts import current_time_note, load_agent_prompts
+
+logger = logging.getLogger(__name__)
 
 _llm = None
 _butler: Optional[ToolCallingAgent] = None
+# The butler keeps a single conversation memory; runs must not interleave
+_run_lock = threading.Lock()
+# A brief requested while another one is running shares that run's answer
+_brief_guard = threading.Lock()
+_brief_inflight: Optional[Future] = None
+
+# Managed agents requested in the same step are I/O-bound and run in parallel
+TOOL_CONCURRENCY_LIMIT = int(os.getenv("TOOL_CONCURRENCY_LIMIT", "4"))
+
+# Upper bound on tokens the butler may spend on one request (0 disables it)
+MAX_TOKENS_PER_REQUEST = int(os.getenv("MAX_TOKENS_PER_REQUEST", "100000"))
+_tokens_used = 0
+_budget_exceeded = False
+
+# Neutral progress notes shown while a managed agent is working; never name agents
+_PROGRESS_NOTES = {
+    "calendar_agent": "Checking your calendar…",
+    "email_agent": "Reviewing your inbox…",
+    "news_agent": "Gathering the latest news…",
+    "weather_agent": "Looking up the weather…",
+}
+
+
+def _track_tokens(memory_step, agent=None) -> None:
+    """Step callback: add up the butler's token usage and enforce the budget."""
+    global _tokens_used, _budget_exceeded
+    usage = getattr(memory_step, "token_usage", None)
+    if usage is None:
+        return
+
+    _tokens_used += usage.input_tokens + usage.output_tokens
+    if MAX_TOKENS_PER_REQUEST and _tokens_used > MAX_TOKENS_PER_REQUEST and not _budget_exceeded:
+        _budget_exceeded = True
+        # Stop before the next step; raising here would keep smolagents from
+        # recording this step in memory
+        (agent or _butler).interrupt()
+
+
+def _start_request() -> None:
+    global _tokens_used, _budget_exceeded
+    _tokens_used = 0
+    _budget_exceeded = False
+
+
+def _finish_request() -> None:
+    logger.info("Langford request used %d tokens", _tokens_used)
+
+
+def _raise_if_over_budget(exc: Exception) -> None:
+    """
+    Turn the interrupt of a budget stop into a clear error. The cut-off run
+    is forgotten, so the next turn doesn't continue from half a task.
+    """
+    if not _budget_exceeded:
+        return
+    _butler.memory.reset()
+    raise RuntimeError(
+        f"Token budget exceeded: {_tokens_used} > {MAX_TOKENS_PER_REQUEST} "
+        "tokens for this request."
+    ) from exc
 
 
 def init_langford():
@@ -28,13 +95,118 @@ def init_langford():
         verbosity_level=LogLevel.DEBUG,
         add_base_tools=False,
         max_steps=8,
+        max_tool_threads=TOOL_CONCURRENCY_LIMIT,
+        step_callbacks=[_track_tokens],
     )
 
 
-def run_langford(message: str) -> str:
-    assert _butler is not None, "init_langford() must be called first"
+def _prepare_query(message: str) -> Tuple[str, bool]:
+    """Map a user message to the butler task and whether memory is reset."""
     msg = message.strip()
+    # The date goes after the request, leaving the cached prompt prefix intact
     if msg.lower() == "brief":
         query = "Please provide my full morning executive brief for today."
-        return _butler.run(query, reset=True)
-    return _butler.run(msg, reset=False)
+        return f"{query}\n\n{current_time_note()}", True
+    return f"{msg}\n\n{current_time_note()}", False
+
+
+def run_langford(message: str) -> str:
+    assert _butler is not None, "init_langford() must be called first"
+    query, reset = _prepare_query(message)
+    with _run_lock:
+        _start_request()
+        try:
+            return _butler.run(query, reset=reset)
+        except Exception as exc:
+            _raise_if_over_budget(exc)
+            raise
+        finally:
+            _finish_request()
+
+
+def reset_langford() -> None:
+    """Forget the conversation so far while keeping the built agents."""
+    assert _butler is not None, "init_langford() must be called first"
+    with _run_lock:
+        _butler.memory.reset()
+
+
+def stream_langford(message: str) -> Iterator[str]:
+    """
+    Run Langford step by step, yielding short progress notes while managed
+    agents are working and the final answer as the last item.
+    """
+    assert _butler is not None, "init_langford() must be called first"
+    query, reset = _prepare_query(message)
+    if reset:
+        return _stream_shared_brief(query)
+    return _stream_steps(query, reset=False)
+
+
+def _stream_shared_brief(query: str) -> Iterator[str]:
+    """
+    Coalesce concurrent brief requests: the first caller runs the brief and
+    everyone arriving meanwhile receives the same final answer.
+    """
+    global _brief_inflight
+    with _brief_guard:
+        shared = _brief_inflight
+        owner = shared is None
+        if owner:
+            shared = _brief_inflight = Future()
+
+    if not owner:
+        yield shared.result()
+        return
+
+    answer = None
+    try:
+        for chunk in _stream_steps(query, reset=True):
+            answer = chunk
+            yield chunk
+        shared.set_result(answer)
+    except BaseException as exc:
+        if not isinstance(exc, Exception):
+            exc = RuntimeError("The running brief was interrupted.")
+        shared.set_exception(exc)
+        raise
+    finally:
+        with _brief_guard:
+            _brief_inflight = None
+
+
+def _stream_steps(query: str, reset: bool) -> Iterator[str]:
+    with _run_lock:
+        _start_request()
+        try:
+            yield from _stream_butler(query, reset)
+        except Exception as exc:
+            _raise_if_over_budget(exc)
+            raise
+        finally:
+            _finish_request()
+
+
+def _stream_butler(query: str, reset: bool) -> Iterator[str]:
+    # Tool calls are announced before they run; older smolagents versions
+    # only report them on the finished ActionStep. Use whichever source the
+    # installed version provides, never both, so each call is announced once
+    # and no note reappears after the tools are done.
+    streams_calls = False
+    for step in _butler.run(query, reset=reset, stream=True):
+        if isinstance(step, FinalAnswerStep):
+            yield str(step.output)
+            continue
+
+        if isinstance(step, ToolCall):
+            streams_calls = True
+            calls = [step]
+        elif isinstance(step, ActionStep) and step.tool_calls and not streams_calls:
+            calls = step.tool_calls
+        else:
+            continue
+
+        for call in calls:
+            note = _PROGRESS_NOTES.get(call.name)
+            if note:
+                yield note
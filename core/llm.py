@@ -1,39 +1,82 @@
 from __future__ import annotations
 
+import atexit
 import os
+from collections import deque
+from functools import lru_cache
 
 import httpx
 from openai import OpenAI
 from transformers import AutoTokenizer
-from smolagents import OpenAIModel, LiteLLMModel
+from smolagents import OpenAIModel
+
+TOKENIZER_ID = "mistralai/Mistral-7B-Instruct-v0.3"
+# User/assistant turns kept in llm_object.history; the system message is pinned separately
+MAX_TURNS = int(os.getenv("LLM_MAX_TURNS", "40"))
+
+_SHARED_HTTP: httpx.Client | None = None
+
+
+@lru_cache(maxsize=1)
+def _get_tokenizer():
+    """Load the shared chat-template tokenizer once per process."""
+    # Prefer the local HF cache so warm starts skip the Hub metadata requests
+    try:
+        return AutoTokenizer.from_pretrained(
+            TOKENIZER_ID, use_fast=True, local_files_only=True
+        )
+    except OSError:
+        return AutoTokenizer.from_pretrained(TOKENIZER_ID, use_fast=True)
+
+
+def _http() -> httpx.Client:
+    """
+    Process-wide HTTP/2 client, so every llm_object shares one connection pool
+    and concurrent completions multiplex over the same connection.
+    """
+    global _SHARED_HTTP
+    if _SHARED_HTTP is None:
+        _SHARED_HTTP = httpx.Client(
+            http2=True,
+            verify=False,
+            timeout=httpx.Timeout(timeout=360.0, connect=5.0),
+            limits=httpx.Limits(max_connections=256, max_keepalive_connections=64),
+        )
+        atexit.register(_SHARED_HTTP.close)
+    return _SHARED_HTTP
 
 
 class llm_object:
     def __init__(self) -> None:
-        self.history = []
+        self._system_msg: dict | None = None
+        self.history: deque[dict] = deque(maxlen=2 * MAX_TURNS)
+        self._rendered_cache: dict[tuple[int, bool], str] = {}
 
         provider = os.getenv("LLM_PROVIDER", "groq").lower()
 
-        # Shared tokenizer (unchanged)
-        self.tokenizer = AutoTokenizer.from_pretrained(
-            "mistralai/Mistral-7B-Instruct-v0.3", use_fast=True
-        )
+        # Shared tokenizer, loaded once and reused by every instance
+        self.tokenizer = _get_tokenizer()
 
         if provider == "groq":
             base_url = "https://api.groq.com/openai/v1/"
             api_key = os.getenv("GROQ_API_KEY", "x")
             model_name = os.getenv("GROQ_MODEL_ID", "llama-3.1-70b-versatile")
 
+            self.base_url = base_url
             self.model_name = model_name
 
-            self.model = LiteLLMModel(
-                model_id=f"groq/{model_name}",
+            # Groq speaks the OpenAI API directly; no LiteLLM translation layer
+            self.model = OpenAIModel(
+                model_id=self.model_name,
+                api_base=self.base_url,
                 api_key=api_key,
                 temperature=0.2,
                 max_tokens=2048,
-                tool_choice="auto",
+                # No tool_choice here: model kwargs override the per-call
+                # choice, which would un-force SingleToolAgent's tool call
                 flatten_messages_as_text=True,
             )
+            self.client = self.model.client
 
         else:
             base_url = os.getenv(
@@ -46,19 +89,13 @@ class llm_object:
                 "Meta-Llama-3.1-70B-Instruct-AWQ-INT4",
             )
 
-            httpx_client = httpx.Client(
-                http2=True,
-                verify=False,
-                timeout=httpx.Timeout(timeout=360.0, connect=5.0),
-            )
-
             self.base_url = base_url
             self.model_name = model_name
 
             self.client = OpenAI(
                 base_url=self.base_url,
                 api_key=api_key,
-                http_client=httpx_client,
+                http_client=_http(),
             )
 
             self.model = OpenAIModel(
@@ -72,12 +109,27 @@ class llm_object:
             self.model.client = self.client
 
     def purge(self) -> None:
+        self._system_msg = None
         self.history.clear()
+        self._rendered_cache.clear()
 
     def set_system(self, content: str, purge_existing: bool = False) -> None:
+        """Set the pinned system message; it never falls out of the turn window."""
         if purge_existing:
             self.purge()
-        self.remember("system", content)
+        self._system_msg = {"role": "system", "content": content}
+
+    def messages(self) -> list[dict]:
+        """System message (if any) followed by the most recent turns."""
+        # The window evicts single messages; never start on half a turn, the
+        # chat template requires roles to alternate beginning with "user"
+        start = 0
+        while start < len(self.history) and self.history[start]["role"] != "user":
+            start += 1
+        history = list(self.history)[start:]
+        if self._system_msg is None:
+            return history
+        return [self._system_msg, *history]
 
     def remember(self, role: str, content: str) -> None:
         self.history.append({"role": role, "content": content})
@@ -103,8 +155,22 @@ class llm_object:
             raise RuntimeError(f"Empty content in response: {e}")
 
     def render_history(self, add_generation_prompt: bool = True) -> str:
-        return self.tokenizer.apply_chat_template(
-            self.history,
+        """Render the chat history, reusing the last render if nothing changed."""
+        messages = self.messages()
+        key = (
+            hash(tuple((m["role"], m["content"]) for m in messages)),
+            add_generation_prompt,
+        )
+        cached = self._rendered_cache.get(key)
+        if cached is not None:
+            return cached
+
+        rendered = self.tokenizer.apply_chat_template(
+            messages,
             tokenize=False,
             add_generation_prompt=add_generation_prompt,
         )
+        # Only the latest history state can be requested again; keep it small
+        self._rendered_cache.clear()
+        self._rendered_cache[key] = rendered
+        return rendered
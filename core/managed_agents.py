@@ -1,10 +1,13 @@
+import threading
 from dataclasses import dataclass
+from functools import lru_cache, wraps
 from smolagents import ToolCallingAgent
 
 from agents.calendar_agent import calendar_agent
 from agents.email_agent import email_agent
 from agents.news_agent import news_agent
 from agents.weather_agent import weather_agent
+from core.managed_prompts import load_agent_prompts
 
 
 @dataclass
@@ -15,10 +18,37 @@ class AgentContainer:
     weather: ToolCallingAgent
 
 
+def _prepare_runs(agent: ToolCallingAgent) -> ToolCallingAgent:
+    """
+    Wrap `agent.run` so every run is told the current date and only one run
+    at a time uses the agent.
+
+    The date line is rendered per run rather than frozen into the agent's
+    instructions, which would go stale in a long-running bot. The butler
+    runs managed-agent calls of one step in parallel; two calls to the same
+    agent (e.g. weather for two cities) would otherwise share its memory,
+    task and step counter. Different agents still run concurrently.
+    """
+    prompts = load_agent_prompts(agent.name)
+    lock = threading.Lock()
+    run = agent.run
+
+    @wraps(run)
+    def prepared_run(task, *args, **kwargs):
+        task = f"{task}\n\n{prompts.dynamic_note()}"
+        with lock:
+            return run(task, *args, **kwargs)
+
+    agent.run = prepared_run
+    return agent
+
+
+@lru_cache(maxsize=1)
 def build_agents(model: str) -> AgentContainer:
+    """Build the managed agents once per model and reuse them process-wide."""
     return AgentContainer(
-        calendar=calendar_agent(model),
-        email=email_agent(model),
-        news=news_agent(model),
-        weather=weather_agent(model),
+        calendar=_prepare_runs(calendar_agent(model)),
+        email=_prepare_runs(email_agent(model)),
+        news=_prepare_runs(news_agent(model)),
+        weather=_prepare_runs(weather_agent(model)),
     )
@@ -1,29 +1,113 @@
 from pathlib import Path
 from dataclasses import dataclass
+from functools import lru_cache
+import json
 import yaml
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
 BASE_DIR = Path(__file__).resolve().parent
 PROMPTS_DIR = BASE_DIR.parent / "prompts"
-now_iso = datetime.now(ZoneInfo("Europe/Vienna")).isoformat(timespec="seconds")
+COMPILED_PROMPTS = PROMPTS_DIR / "compiled.json"
+NOW_PLACEHOLDER = "{{NOW_ISO}}"
+TIMEZONE = ZoneInfo("Europe/Vienna")
 
 
 @dataclass
 class AgentPromptBundle:
     description: str
-    system: str
+    system_static: str
+    system_dynamic: str
 
+    @property
+    def system(self) -> str:
+        """
+        Instructions without the time-dependent lines, so they stay an
+        identical, cacheable prefix across requests. The agent's runs get
+        those lines from dynamic_note() instead.
+        """
+        return self.system_static
 
-def load_agent_prompts(agent_name: str) -> AgentPromptBundle:
-    path = PROMPTS_DIR / f"{agent_name}.yaml"
+    def dynamic_note(self) -> str:
+        """The time-dependent prompt lines, rendered for the current moment."""
+        if not self.system_dynamic:
+            return current_time_note()
+        now_iso = datetime.now(TIMEZONE).isoformat(timespec="seconds")
+        return self.system_dynamic.replace(NOW_PLACEHOLDER, now_iso)
+
+
+def _split_system_prompt(system_prompt: str) -> tuple[str, str]:
+    """
+    Separate lines that depend on the current time from the static prompt.
+    The dynamic lines keep their placeholder and are rendered per run.
+    """
+    static_lines = []
+    dynamic_lines = []
+    for line in system_prompt.splitlines():
+        if NOW_PLACEHOLDER in line:
+            dynamic_lines.append(line.strip())
+        else:
+            static_lines.append(line)
+    return "\n".join(static_lines).strip(), "\n".join(dynamic_lines)
+
+
+# libyaml's C loader when available, pure-Python otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def compile_prompts() -> dict:
+    """
+    Parse every prompt YAML once and store them together in compiled.json,
+    so later starts only need a single JSON load.
+    """
+    data = {}
+    for path in sorted(PROMPTS_DIR.glob("*.yaml")):
+        raw = yaml.load(path.read_text(encoding="utf-8"), Loader=_YAML_LOADER)
+        data[path.stem] = {
+            "description": raw["description"],
+            "system_prompt": raw["system_prompt"],
+        }
+
+    try:
+        COMPILED_PROMPTS.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    except OSError:
+        pass  # read-only checkout: keep working from the in-memory result
+
+    return data
 
-    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+
+@lru_cache(maxsize=1)
+def _load_prompt_data() -> dict:
+    """Load compiled prompts, recompiling when any YAML is newer than the JSON."""
+    newest_yaml = max(
+        (path.stat().st_mtime for path in PROMPTS_DIR.glob("*.yaml")), default=0.0
+    )
+    try:
+        if COMPILED_PROMPTS.stat().st_mtime >= newest_yaml:
+            return json.loads(COMPILED_PROMPTS.read_bytes())
+    except (OSError, ValueError):
+        pass
+    return compile_prompts()
+
+
+def current_time_note() -> str:
+    """Per-turn date line; cheap to build, so it is never cached."""
+    return f"Today is {datetime.now(TIMEZONE):%A, %Y-%m-%d %H:%M} (Europe/Vienna)."
+
+
+@lru_cache(maxsize=None)
+def load_agent_prompts(agent_name: str) -> AgentPromptBundle:
+    data = _load_prompt_data()[agent_name]
 
     description = data["description"]
-    system = data["system_prompt"].replace("{{NOW_ISO}}", now_iso)
+    system_static, system_dynamic = _split_system_prompt(data["system_prompt"])
 
     return AgentPromptBundle(
-        description=description, 
-        system=system
+        description=description,
+        system_static=system_static,
+        system_dynamic=system_dynamic,
     )
+
+
+if __name__ == "__main__":
+    compile_prompts()
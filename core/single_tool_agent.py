@@ -0,0 +1,78 @@
+import json
+import logging
+from typing import Any, Optional
+
+from smolagents import ToolCallingAgent
+
+logger = logging.getLogger(__name__)
+
+
+class SingleToolAgent(ToolCallingAgent):
+    """
+    ToolCallingAgent for agents whose tasks are answered by a single tool call.
+
+    A plain task is answered with one model call that is forced to use the
+    agent's tool (or one of its tools, e.g. a single and a batch variant); the
+    tool output is returned directly, skipping the extra turn the agent would
+    otherwise spend summarising it. Any failure falls back to the regular
+    ToolCallingAgent loop.
+    """
+
+    def run(self, task: str, stream: bool = False, **kwargs):
+        if not stream and not kwargs.get("images") and not kwargs.get("additional_args"):
+            try:
+                result = self._run_single_tool(task)
+            except Exception:  # noqa: BLE001
+                logger.warning(
+                    "%s: single-call path failed, falling back to the agent loop",
+                    self.name,
+                    exc_info=True,
+                )
+                result = None
+            if result is not None:
+                return result
+
+        return super().run(task, stream=stream, **kwargs)
+
+    def _run_single_tool(self, task: str) -> Optional[str]:
+        tools = {name: tool for name, tool in self.tools.items() if name != "final_answer"}
+        if not tools:
+            return None
+        if len(tools) == 1:
+            tool_choice: Any = {"type": "function", "function": {"name": next(iter(tools))}}
+        else:
+            tool_choice = "required"
+
+        messages = [
+            {"role": "system", "content": [{"type": "text", "text": self.instructions or ""}]},
+            {"role": "user", "content": [{"type": "text", "text": task}]},
+        ]
+        message = self.model.generate(
+            messages,
+            tools_to_call_from=list(tools.values()),
+            tool_choice=tool_choice,
+        )
+        if not message.tool_calls:
+            message = self.model.parse_tool_calls(message)
+
+        # Several calls (e.g. one per city) go to the regular loop, which runs them in parallel
+        if len(message.tool_calls) != 1:
+            return None
+        call = message.tool_calls[0]
+        tool = tools.get(call.function.name)
+        if tool is None:
+            return None
+
+        arguments: Any = call.function.arguments
+        if isinstance(arguments, str):
+            arguments = json.loads(arguments) if arguments.strip() else {}
+
+        output = tool(**arguments)
+        # Let the full agent loop deal with bad arguments or upstream errors
+        if isinstance(output, dict) and output.get("error"):
+            return None
+        if isinstance(output, list) and output and all(
+            isinstance(item, dict) and item.get("error") for item in output
+        ):
+            return None
+        return str(output)
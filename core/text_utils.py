@@ -0,0 +1,11 @@
+import re
+
+# Escaped line breaks as they appear in model output, longest first
+_ESC_RE = re.compile(r"\\\\n|\\r\\n|\\n|\\r")
+
+
+def show(text: str) -> str:
+    """
+    Normalize escaped newlines so multi-line answers look normal when displayed.
+    """
+    return _ESC_RE.sub("\n", str(text))
@@ -1,18 +1,7 @@
 # cli_langford.py
 
-from core.langford_service import init_langford, run_langford
-
-
-def show(text: str) -> str:
-    """
-    Normalize escaped newlines so multi-line answers look normal in the terminal.
-    """
-    s = str(text)
-    s = s.replace("\\r\\n", "\n")
-    s = s.replace("\\n", "\n")
-    s = s.replace("\\r", "\n")
-    s = s.replace("\\\\n", "\n")
-    return s
+from core.langford_service import init_langford, reset_langford, run_langford
+from core.text_utils import show
 
 
 def repl() -> None:
@@ -22,7 +11,7 @@ def repl() -> None:
     init_langford()
 
     print("Langford CLI ready.")
-    print("Type 'brief' for your executive brief, 'exit' to quit.\n")
+    print("Type 'brief' for your executive brief, 'purge' to start over, 'exit' to quit.\n")
 
     while True:
         try:
@@ -38,6 +27,11 @@ def repl() -> None:
             print("Bye.")
             break
 
+        if user_msg.lower() == "purge":
+            reset_langford()
+            print("Conversation cleared.\n")
+            continue
+
         # Everything else is passed straight to Langford
         try:
             result = run_langford(user_msg)
@@ -1,13 +1,16 @@
 # interfaces/telegram_bot.py
+import asyncio
 import os
 import logging
 from telegram import Update
+from telegram.error import TelegramError
 from telegram.ext import (
     ApplicationBuilder, CommandHandler, MessageHandler, ContextTypes, filters
 )
 from dotenv import load_dotenv
 
-from core.langford_service import init_langford, run_langford
+from core.langford_service import init_langford, stream_langford
+from core.text_utils import show
 
 load_dotenv()
 logging.basicConfig()
@@ -26,12 +29,51 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     text = update.message.text
     logger.info("Message: %s", text)
+
+    # Send a placeholder right away and keep editing it as Langford progresses
+    sent = await update.message.reply_text("One moment…")
+    shown = sent.text
+
+    # Langford is blocking; advance it in a worker thread so the event loop
+    # keeps serving other updates meanwhile
+    updates = stream_langford(text)
+    latest = shown
     try:
-        reply = run_langford(text)
+        while True:
+            chunk = await asyncio.to_thread(next, updates, None)
+            if chunk is None:
+                break
+            latest = show(chunk) or latest
+            if latest != shown and await _try_edit(sent, latest):
+                shown = latest
     except Exception:
         logger.exception("Error while running Langford:")
-        reply = "Something went wrong in the backend. Please try again in a moment."
-    await update.message.reply_text(reply)
+        await _try_edit(
+            sent, "Something went wrong in the backend. Please try again in a moment."
+        )
+        return
+    finally:
+        updates.close()
+
+    # The final answer must arrive even if editing the placeholder failed
+    if latest != shown:
+        try:
+            await update.message.reply_text(latest)
+        except TelegramError:
+            logger.exception("Could not deliver Langford's answer:")
+
+
+async def _try_edit(sent, text: str) -> bool:
+    """
+    Best-effort edit of the placeholder message. Flood control, "message is
+    not modified" or a network blip must not abort the Langford run.
+    """
+    try:
+        await sent.edit_text(text)
+        return True
+    except TelegramError as exc:
+        logger.warning("Could not update Telegram message: %s", exc)
+        return False
 
 
 def main():
@@ -41,7 +83,7 @@ def main():
     if not token:
         raise RuntimeError("Please set TELEGRAM_BOT_TOKEN.")
 
-    app = ApplicationBuilder().token(token).build()
+    app = ApplicationBuilder().token(token).concurrent_updates(True).build()
     app.add_handler(CommandHandler("start", start))
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
     app.run_polling()
@@ -1,8 +1,13 @@
 from smolagents import tool
-from datetime import datetime, timedelta, timezone
-import requests
+from datetime import date as _date, timedelta
+from types import MappingProxyType
 from typing import List, Dict, Optional, Union, Any
-from tools.calendar.google_token import _get_access_token
+from tools.calendar.google_token import EVENTS_URL_FMT, _SESSION, _get_access_token
+
+_EVENTS_PARAMS_BASE = MappingProxyType({"singleEvents": True, "orderBy": "startTime"})
+# Shared fallback for events without start/end; only ever read, never mutated
+_EMPTY: Dict[str, Any] = {}
+_WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
 
 
 def _normalize_date_input(raw: Union[str, Dict[str, Any], None]) -> Optional[str]:
@@ -82,8 +87,9 @@ def check_events(
     if not start_str:
         return [{"error": "Invalid or empty start date", "raw_input": str(date)}]
 
+    # Only the calendar dates matter; the day bounds are fixed UTC midnights
     try:
-        start_dt = datetime.fromisoformat(start_str).replace(tzinfo=timezone.utc)
+        start_day = _date.fromisoformat(start_str[:10])
     except Exception as e:
         return [
             {
@@ -94,7 +100,7 @@ def check_events(
 
     if end_str:
         try:
-            end_dt = datetime.fromisoformat(end_str).replace(tzinfo=timezone.utc)
+            end_day = _date.fromisoformat(end_str[:10])
         except Exception as e:
             return [
                 {
@@ -102,28 +108,18 @@ def check_events(
                     "raw_end_date": end_str,
                 }
             ]
-        # inclusive range → add one day for timeMax
-        end_dt = end_dt + timedelta(days=1)
     else:
-        # Single day: [start, start+1)
-        end_dt = start_dt + timedelta(days=1)
-
-    time_min = start_dt.isoformat()
-    time_max = end_dt.isoformat()
-
-    url = f"https://www.googleapis.com/calendar/v3/calendars/{CALENDAR_ID}/events"
-    params = {
-        "timeMin": time_min,
-        "timeMax": time_max,
-        "singleEvents": True,
-        "orderBy": "startTime",
-    }
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-    }
+        end_day = start_day
+
+    # inclusive range → timeMax is midnight after the last day
+    time_min = f"{start_day.isoformat()}T00:00:00Z"
+    time_max = f"{(end_day + timedelta(days=1)).isoformat()}T00:00:00Z"
+
+    url = EVENTS_URL_FMT.format(cid=CALENDAR_ID)
+    params = {**_EVENTS_PARAMS_BASE, "timeMin": time_min, "timeMax": time_max}
 
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = _SESSION.get(url, params=params, timeout=10)
         response.raise_for_status()
         events = response.json().get("items", [])
     except Exception as e:
@@ -131,19 +127,18 @@ def check_events(
 
     result: List[Dict[str, Any]] = []
     for e in events:
-        start = e.get("start", {})
-        end = e.get("end", {})
+        start = e.get("start") or _EMPTY
+        end = e.get("end") or _EMPTY
 
         start_raw = start.get("dateTime") or start.get("date")
         end_raw = end.get("dateTime") or end.get("date")
         weekday: Optional[str] = None
 
         if start_raw:
+            # Both "date" and "dateTime" values start with YYYY-MM-DD
             try:
-                weekday = datetime.fromisoformat(
-                    start_raw.replace("Z", "+00:00")
-                ).strftime("%A")
-            except Exception:
+                weekday = _WEEKDAYS[_date.fromisoformat(start_raw[:10]).weekday()]
+            except ValueError:
                 weekday = None
 
         result.append(
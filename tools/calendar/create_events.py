@@ -1,12 +1,26 @@
 from smolagents import tool
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, List, Tuple, Union
 from datetime import datetime, timedelta
+from email.parser import BytesParser
 from zoneinfo import ZoneInfo  # Python 3.9+
+import json
 import os
-import requests
-from tools.calendar.google_token import _get_access_token
+import re
+from tools.calendar.google_token import EVENTS_URL_FMT, _SESSION, _get_access_token
 
 CALENDAR_TIMEZONE = os.getenv("GOOGLE_CALENDAR_TIMEZONE", "Europe/Vienna")
+_TZ = ZoneInfo(CALENDAR_TIMEZONE)
+
+BATCH_URL = "https://www.googleapis.com/batch/calendar/v3"
+BATCH_BOUNDARY = "batch_langford"
+BATCH_MAX_CALLS = 50  # Google caps a Calendar batch at 50 calls
+
+# One number of a duration with its optional unit: "90", "45 min", "1.5 hours", "1h"
+_DURATION_PART = re.compile(
+    r"(-?\d+(?:[.,]\d+)?)\s*(h|hrs?|hours?|m|mins?|minutes?)?(?![a-z])", re.IGNORECASE
+)
+# Clock-style duration: "1:30" is 1 hour 30 minutes
+_DURATION_HMM = re.compile(r"\s*(\d+):([0-5]\d)\s*$")
 
 
 def _to_bool(value: Union[bool, str, int]) -> bool:
@@ -18,17 +32,55 @@ def _to_bool(value: Union[bool, str, int]) -> bool:
     return bool(value)
 
 
-def _to_int(value: Union[int, str, float], default: int) -> int:
-    """Coerce common LLM outputs into an int with a safe default."""
+def _to_minutes(value: Union[int, str, float], default: int) -> int:
+    """
+    Coerce common LLM duration outputs into minutes with a safe default.
+
+    Understands "45", "45 minutes", "2h", "1.5 hours", "1h 30", "1h30m" and
+    "1:30". Ambiguous text with several bare numbers (e.g. "1 30") and
+    durations that are not positive give `default`.
+    """
+    minutes = _parse_minutes(value)
+    if minutes is None or minutes <= 0:
+        return default
+    return minutes
+
+
+def _parse_minutes(value: Union[int, str, float]) -> Optional[int]:
+    """Minutes in `value`, or None if it doesn't read as one duration."""
     try:
-        if isinstance(value, str):
-            digits = "".join(filter(str.isdigit, value))
-            if digits:
-                return int(digits)
-            return default
         return int(value)
-    except Exception:
-        return default
+    except (TypeError, ValueError, OverflowError):
+        pass
+    try:
+        return int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        pass
+    if not isinstance(value, str):
+        return None
+
+    m = _DURATION_HMM.match(value)
+    if m:
+        return int(m[1]) * 60 + int(m[2])
+
+    parts = _DURATION_PART.findall(value)
+    total = 0.0
+    saw_hours = False
+    bare = 0
+    for number, unit in parts:
+        amount = float(number.replace(",", "."))
+        if unit[:1].lower() == "h":
+            total += amount * 60
+            saw_hours = True
+        else:
+            # Minutes, whether spelled out or bare ("45", the "30" of "1h 30")
+            total += amount
+            bare += not unit
+
+    # A bare number is only unambiguous alone or as the minutes after hours
+    if not parts or bare > 1 or (bare and len(parts) > 1 and not saw_hours):
+        return None
+    return int(round(total))
 
 
 def _extract_datetime_str(raw: Union[str, Dict[str, Any]]) -> str:
@@ -60,8 +112,7 @@ def _extract_date_str(raw: Union[str, Dict[str, Any]]) -> str:
     return s
 
 
-@tool
-def create_events(
+def _build_event_body(
     summary: str,
     start_date: Union[str, Dict[str, Any]],
     end_date: Optional[Union[str, Dict[str, Any]]] = None,
@@ -71,56 +122,12 @@ def create_events(
     duration_minutes: Union[int, str, float] = 60,
 ) -> Dict[str, Any]:
     """
-    Create a Google Calendar event.
+    Normalize LLM-provided event fields into a Google Calendar event body.
 
-    Use this when the user wants to:
-    - add / schedule / book / put something in the calendar.
-
-    The model must always provide at least:
-    - summary (title)
-    - start_date (date or datetime).
-
-    Args:
-        summary:
-            Event title. Example: "Chinese lesson".
-        start_date:
-            Start date or datetime.
-            - Timed: "2025-11-22T20:00:00"
-            - All-day: "2025-11-22" (or dict from a date tool).
-        end_date:
-            Optional end date/time. If omitted:
-            - all_day=False → start + duration_minutes
-            - all_day=True  → start + 1 day (exclusive, as per Google Calendar)
-        description:
-            Optional event notes.
-        location:
-            Optional location.
-        all_day:
-            True for all-day events (date only).
-        duration_minutes:
-            Used when no explicit end_date is given.
-
-    Returns:
-        dict with the created event:
-          {
-            "id": str,
-            "htmlLink": str,
-            "summary": str,
-            "start": str,
-            "end": str
-          }
-        or:
-          {"error": "...", "requested": {...}} on failure.
+    Returns {"error": ...} instead if the dates cannot be understood.
     """
     all_day_flag = _to_bool(all_day)
-    duration_min_int = _to_int(duration_minutes, default=60)
-
-    access_token, CALENDAR_ID = _get_access_token()
-    url = f"https://www.googleapis.com/calendar/v3/calendars/{CALENDAR_ID}/events"
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json",
-    }
+    duration_min_int = _to_minutes(duration_minutes, default=60)
 
     try:
         if all_day_flag:
@@ -160,9 +167,9 @@ def create_events(
 
             start_dt = datetime.fromisoformat(start_str)
             if start_dt.tzinfo is None:
-                start_dt = start_dt.replace(tzinfo=ZoneInfo(CALENDAR_TIMEZONE))
+                start_dt = start_dt.replace(tzinfo=_TZ)
             else:
-                start_dt = start_dt.astimezone(ZoneInfo(CALENDAR_TIMEZONE))
+                start_dt = start_dt.astimezone(_TZ)
 
             if end_date is not None:
                 end_str = _extract_datetime_str(end_date)
@@ -174,9 +181,9 @@ def create_events(
 
                 end_dt = datetime.fromisoformat(end_str)
                 if end_dt.tzinfo is None:
-                    end_dt = end_dt.replace(tzinfo=ZoneInfo(CALENDAR_TIMEZONE))
+                    end_dt = end_dt.replace(tzinfo=_TZ)
                 else:
-                    end_dt = end_dt.astimezone(ZoneInfo(CALENDAR_TIMEZONE))
+                    end_dt = end_dt.astimezone(_TZ)
             else:
                 end_dt = start_dt + timedelta(minutes=duration_min_int)
 
@@ -206,16 +213,11 @@ def create_events(
     if location:
         body["location"] = location
 
-    try:
-        response = requests.post(url, headers=headers, json=body, timeout=10)
-        response.raise_for_status()
-        event = response.json()
-    except Exception as e:
-        return {
-            "error": f"Failed to create event: {str(e)}",
-            "requested": body,
-        }
+    return body
 
+
+def _event_result(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact view of a created event as returned to the agent."""
     return {
         "id": event.get("id"),
         "htmlLink": event.get("htmlLink"),
@@ -225,3 +227,199 @@ def create_events(
         "end": event.get("end", {}).get("dateTime")
         or event.get("end", {}).get("date"),
     }
+
+
+@tool
+def create_events(
+    summary: str,
+    start_date: Union[str, Dict[str, Any]],
+    end_date: Optional[Union[str, Dict[str, Any]]] = None,
+    description: Optional[str] = None,
+    location: Optional[str] = None,
+    all_day: Union[bool, str, int] = False,
+    duration_minutes: Union[int, str, float] = 60,
+) -> Dict[str, Any]:
+    """
+    Create a Google Calendar event.
+
+    Use this when the user wants to:
+    - add / schedule / book / put something in the calendar.
+
+    The model must always provide at least:
+    - summary (title)
+    - start_date (date or datetime).
+
+    Args:
+        summary:
+            Event title. Example: "Chinese lesson".
+        start_date:
+            Start date or datetime.
+            - Timed: "2025-11-22T20:00:00"
+            - All-day: "2025-11-22" (or dict from a date tool).
+        end_date:
+            Optional end date/time. If omitted:
+            - all_day=False → start + duration_minutes
+            - all_day=True  → start + 1 day (exclusive, as per Google Calendar)
+        description:
+            Optional event notes.
+        location:
+            Optional location.
+        all_day:
+            True for all-day events (date only).
+        duration_minutes:
+            Used when no explicit end_date is given.
+
+    Returns:
+        dict with the created event:
+          {
+            "id": str,
+            "htmlLink": str,
+            "summary": str,
+            "start": str,
+            "end": str
+          }
+        or:
+          {"error": "...", "requested": {...}} on failure.
+    """
+    body = _build_event_body(
+        summary,
+        start_date,
+        end_date=end_date,
+        description=description,
+        location=location,
+        all_day=all_day,
+        duration_minutes=duration_minutes,
+    )
+    if "error" in body:
+        return body
+
+    access_token, CALENDAR_ID = _get_access_token()
+    url = EVENTS_URL_FMT.format(cid=CALENDAR_ID)
+
+    try:
+        response = _SESSION.post(url, json=body, timeout=10)
+        response.raise_for_status()
+        event = response.json()
+    except Exception as e:
+        return {
+            "error": f"Failed to create event: {str(e)}",
+            "requested": body,
+        }
+
+    return _event_result(event)
+
+
+def _post_batch(
+    calendar_id: str, bodies: List[Dict[str, Any]]
+) -> List[Tuple[int, Optional[Dict[str, Any]]]]:
+    """
+    Insert several events with one multipart/mixed request to the batch endpoint.
+
+    Returns (status, parsed JSON body) per input body, in input order.
+    """
+    parts = [
+        f"--{BATCH_BOUNDARY}\r\n"
+        "Content-Type: application/http\r\n"
+        f"Content-ID: <item{n}>\r\n\r\n"
+        f"POST /calendar/v3/calendars/{calendar_id}/events HTTP/1.1\r\n"
+        "Content-Type: application/json\r\n\r\n"
+        f"{json.dumps(body)}\r\n"
+        for n, body in enumerate(bodies)
+    ]
+    payload = "".join(parts) + f"--{BATCH_BOUNDARY}--\r\n"
+
+    response = _SESSION.post(
+        BATCH_URL,
+        data=payload.encode("utf-8"),
+        headers={"Content-Type": f"multipart/mixed; boundary={BATCH_BOUNDARY}"},
+        timeout=30,
+    )
+    response.raise_for_status()
+
+    # The response is itself multipart/mixed; let the email parser split it.
+    header = f"Content-Type: {response.headers['Content-Type']}\r\n\r\n"
+    message = BytesParser().parsebytes(header.encode("utf-8") + response.content)
+
+    results: List[Tuple[int, Optional[Dict[str, Any]]]] = [(0, None)] * len(bodies)
+    for part in message.get_payload():
+        match = re.search(r"item(\d+)", part.get("Content-ID", ""))
+        if not match or int(match.group(1)) >= len(bodies):
+            continue
+        head, _, raw_json = part.get_payload().replace("\r\n", "\n").partition("\n\n")
+        status = int(head.split(None, 2)[1])
+        results[int(match.group(1))] = (
+            status,
+            json.loads(raw_json) if raw_json.strip() else None,
+        )
+    return results
+
+
+@tool
+def create_events_bulk(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Create several Google Calendar events in one batched request.
+
+    Use this instead of repeated create_events calls when the user wants to
+    add more than one event at once (e.g. a timetable or a series of meetings).
+
+    Args:
+        events:
+            List of event dicts. Each takes the same fields as create_events:
+            "summary" and "start_date" (required), plus optional "end_date",
+            "description", "location", "all_day" and "duration_minutes".
+
+    Returns:
+        list with one dict per input event, in the same order:
+          {"id", "htmlLink", "summary", "start", "end"} as in create_events,
+          or {"error": "...", ...} for events that could not be created.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(events)
+    pending: List[Tuple[int, Dict[str, Any]]] = []
+
+    for i, event in enumerate(events):
+        if not isinstance(event, dict) or not event.get("summary") or not event.get("start_date"):
+            results[i] = {
+                "error": "Each event needs at least summary and start_date",
+                "raw_event": str(event),
+            }
+            continue
+
+        body = _build_event_body(
+            event["summary"],
+            event["start_date"],
+            end_date=event.get("end_date"),
+            description=event.get("description"),
+            location=event.get("location"),
+            all_day=event.get("all_day", False),
+            duration_minutes=event.get("duration_minutes", 60),
+        )
+        if "error" in body:
+            results[i] = body
+        else:
+            pending.append((i, body))
+
+    if pending:
+        access_token, CALENDAR_ID = _get_access_token()
+
+        for start in range(0, len(pending), BATCH_MAX_CALLS):
+            chunk = pending[start:start + BATCH_MAX_CALLS]
+            try:
+                responses = _post_batch(CALENDAR_ID, [body for _, body in chunk])
+            except Exception as e:
+                for i, body in chunk:
+                    results[i] = {
+                        "error": f"Failed to create event: {str(e)}",
+                        "requested": body,
+                    }
+                continue
+
+            for (i, body), (status, event) in zip(chunk, responses):
+                if event is None or not 200 <= status < 300:
+                    results[i] = {
+                        "error": f"Failed to create event: HTTP {status or 'no response'}",
+                        "requested": body,
+                    }
+                else:
+                    results[i] = _event_result(event)
+
+    return results
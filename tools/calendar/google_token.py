@@ -2,19 +2,39 @@ from google.oauth2 import service_account
 from google.auth.transport.requests import Request
 from dotenv import load_dotenv
 import os
+import threading
+from typing import Optional, Tuple
+from tools.http_session import build_session
 
 load_dotenv()
 
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
 SERVICE_ACCOUNT_FILE = os.getenv("GOOGLE_TOKEN_PATH")
 CALENDAR_ID = os.getenv("GOOGLE_MAIL")
+EVENTS_URL_FMT = "https://www.googleapis.com/calendar/v3/calendars/{cid}/events"
 
+# Keep-alive session for the Calendar API; carries the current bearer token
+_SESSION = build_session()
 
-def _get_access_token() -> str:
-    """Get a fresh OAuth2 access token from the service account."""
-    creds = service_account.Credentials.from_service_account_file(
-        SERVICE_ACCOUNT_FILE,
-        scopes=SCOPES,
-    )
-    creds.refresh(Request())
-    return creds.token, CALENDAR_ID
+_CREDS: Optional[service_account.Credentials] = None
+_CREDS_LOCK = threading.Lock()
+
+
+def _get_access_token() -> Tuple[str, str]:
+    """
+    Get a valid OAuth2 access token from the service account.
+
+    The credentials are loaded once and only refreshed when the cached token
+    is missing or expired.
+    """
+    global _CREDS
+    with _CREDS_LOCK:
+        if _CREDS is None:
+            _CREDS = service_account.Credentials.from_service_account_file(
+                SERVICE_ACCOUNT_FILE,
+                scopes=SCOPES,
+            )
+        if not _CREDS.valid:
+            _CREDS.refresh(Request())
+            _SESSION.headers["Authorization"] = f"Bearer {_CREDS.token}"
+        return _CREDS.token, CALENDAR_ID
@@ -1,11 +1,148 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from smolagents import tool
 
 from zoneinfo import ZoneInfo
 import dateparser
+import re
+
+# English plus German for the Vienna user; skips loading every other locale
+_LANGUAGES = ["en", "de"]
+
+# The first parse loads locale data from disk; pay that at import, not on a request
+try:
+    dateparser.parse("today", languages=_LANGUAGES, settings={"TIMEZONE": "UTC"})
+except Exception:
+    pass
+
+# The agent passes the same few timezone names over and over
+_zone = lru_cache(maxsize=32)(ZoneInfo)
+
+# Fast path for the phrases the agent sends most; anything else goes to dateparser
+_ISO_RE = re.compile(r"^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2})?)?$")
+_WEEKDAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+_RELATIVE_DAYS = {"today": 0, "tomorrow": 1, "yesterday": -1}
+_TIME = r"(?:\s+(?:at\s+)?(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>am|pm)?)?"
+_RELATIVE_RE = re.compile(rf"^(?P<day>today|tomorrow|yesterday){_TIME}$")
+_WEEKDAY_RE = re.compile(rf"^(?:(?P<which>next|this)\s+)?(?P<day>{'|'.join(_WEEKDAY_NAMES)}){_TIME}$")
+
+
+def _fast_time(match: re.Match) -> Optional[tuple]:
+    """(hour, minute) from a matched time suffix, or None if it is ambiguous."""
+    hour, minute, ampm = match.group("hour", "minute", "ampm")
+    if hour is None:
+        return ()
+    if minute is None and ampm is None:
+        return None  # a bare number could be a day, leave it to dateparser
+    h, m = int(hour), int(minute or 0)
+    if ampm:
+        if not 1 <= h <= 12:
+            return None
+        h = h % 12 + (12 if ampm == "pm" else 0)
+    if h > 23 or m > 59:
+        return None
+    return h, m
+
+
+def _fast_parse(expression: str, base_dt: datetime) -> Optional[datetime]:
+    """Resolve ISO dates, today/tomorrow/yesterday and weekdays without dateparser."""
+    text = " ".join(expression.lower().split())
+
+    if _ISO_RE.match(text.upper()):
+        parsed = datetime.fromisoformat(text.upper())
+        return parsed.replace(tzinfo=base_dt.tzinfo)
+
+    match = _RELATIVE_RE.match(text)
+    if match:
+        day = base_dt + timedelta(days=_RELATIVE_DAYS[match.group("day")])
+    else:
+        match = _WEEKDAY_RE.match(text)
+        if not match:
+            return None
+        offset = _WEEKDAY_NAMES.index(match.group("day")) - base_dt.weekday()
+        if match.group("which") == "this":
+            offset %= 7
+        else:
+            offset = (offset - 1) % 7 + 1
+        day = (base_dt + timedelta(days=offset)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+
+    time = _fast_time(match)
+    if time is None:
+        return None
+    if time:
+        day = day.replace(hour=time[0], minute=time[1], second=0, microsecond=0)
+    return day
+
+
+@lru_cache(maxsize=256)
+def _resolve(expression: str, now_iso: str, timezone: str) -> Dict[str, Any]:
+    """
+    Resolve a normalized expression against a reference time.
+
+    Cached: the agent tends to re-resolve the same phrases within a session.
+    The caller adds "original_expression" to a copy of the result.
+    """
+    tz = _zone(timezone)
+    try:
+        base_dt = datetime.fromisoformat(now_iso)
+        if base_dt.tzinfo is None:
+            base_dt = base_dt.replace(tzinfo=tz)
+        else:
+            base_dt = base_dt.astimezone(tz)
+    except Exception as exc:
+        return {
+            "ok": False,
+            "error": f"invalid_now_iso: {exc}",
+            "timezone": timezone,
+        }
+
+    try:
+        parsed = _fast_parse(expression, base_dt)
+    except ValueError:
+        parsed = None
+
+    # Parse with dateparser
+    if parsed is None:
+        parsed = dateparser.parse(
+            expression,
+            languages=_LANGUAGES,
+            settings={
+                "RELATIVE_BASE": base_dt,
+                "RETURN_AS_TIMEZONE_AWARE": True,
+                "TIMEZONE": timezone,
+                "PREFER_DATES_FROM": "future",
+            },
+        )
+
+    if parsed is None:
+        return {
+            "ok": False,
+            "error": "could_not_parse",
+            "timezone": timezone,
+        }
+
+    # Normalize to target timezone
+    try:
+        parsed = parsed.astimezone(tz)
+    except Exception:
+        parsed = parsed  # best effort; should already be TZ-aware
+
+    iso_dt = parsed.isoformat(timespec="seconds")
+    date_str = parsed.date().isoformat()
+    time_str = parsed.strftime("%H:%M")
+
+    return {
+        "ok": True,
+        "iso_datetime": iso_dt,
+        "date": date_str,
+        "time": time_str,
+        "timezone": timezone,
+    }
 
 
 @tool
@@ -59,7 +196,7 @@ def resolve_date_expression(
 
     # Determine reference "now"
     try:
-        tz = ZoneInfo(timezone)
+        tz = _zone(timezone)
     except Exception as exc:
         return {
             "ok": False,
@@ -68,57 +205,9 @@ def resolve_date_expression(
             "timezone": timezone,
         }
 
-    try:
-        if now_iso:
-            base_dt = datetime.fromisoformat(str(now_iso))
-            if base_dt.tzinfo is None:
-                base_dt = base_dt.replace(tzinfo=tz)
-            else:
-                base_dt = base_dt.astimezone(tz)
-        else:
-            base_dt = datetime.now(tz)
-    except Exception as exc:
-        return {
-            "ok": False,
-            "error": f"invalid_now_iso: {exc}",
-            "original_expression": expression_str,
-            "timezone": timezone,
-        }
-
-    # Parse with dateparser
-    parsed = dateparser.parse(
-        expression_str,
-        settings={
-            "RELATIVE_BASE": base_dt,
-            "RETURN_AS_TIMEZONE_AWARE": True,
-            "TIMEZONE": timezone,
-            "PREFER_DATES_FROM": "future",
-        },
-    )
-
-    if parsed is None:
-        return {
-            "ok": False,
-            "error": "could_not_parse",
-            "original_expression": expression_str,
-            "timezone": timezone,
-        }
-
-    # Normalize to target timezone
-    try:
-        parsed = parsed.astimezone(tz)
-    except Exception:
-        parsed = parsed  # best effort; should already be TZ-aware
-
-    iso_dt = parsed.isoformat(timespec="seconds")
-    date_str = parsed.date().isoformat()
-    time_str = parsed.strftime("%H:%M")
+    if not now_iso:
+        # Bucket "now" to the minute so repeated phrases hit the cache for up to 60 s
+        now_iso = datetime.now(tz).replace(second=0, microsecond=0).isoformat()
 
-    return {
-        "ok": True,
-        "iso_datetime": iso_dt,
-        "date": date_str,
-        "time": time_str,
-        "timezone": timezone,
-        "original_expression": expression_str,
-    }
+    result = _resolve(" ".join(expression_str.lower().split()), str(now_iso), timezone)
+    return {**result, "original_expression": expression_str}
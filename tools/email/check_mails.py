@@ -1,24 +1,128 @@
 from smolagents import tool
-from typing import Dict, Any, List, Union
+import heapq
+import re
+from typing import Dict, Any, List, Tuple, Union
 from datetime import datetime, timedelta, timezone
-import requests
-from tools.email.get_graph_token import _get_ms_access_token
+from types import MappingProxyType
+from tools.email.get_graph_token import _SESSION, _get_ms_access_token
+from tools.ttl_cache import ttl_cache
+
+_GRAPH_URL = "https://graph.microsoft.com/v1.0/me/messages"
+_GRAPH_SELECT = (
+    "subject,from,receivedDateTime,importance,"
+    "isRead,inferenceClassification,bodyPreview,webLink"
+)
+_GRAPH_PARAMS_BASE = MappingProxyType(
+    {"$orderby": "receivedDateTime desc", "$select": _GRAPH_SELECT}
+)
+
+_DIGITS_RE = re.compile(r"\d+")
+
+# Shared fallback for missing nested objects; only ever read, never mutated
+_EMPTY: Dict[str, Any] = {}
 
 
 def _to_int_with_default(value: Union[int, str, float], default: int) -> int:
     """Coerce common LLM outputs into an int, with a safe default."""
+    if isinstance(value, str):
+        # First number only, e.g. "8 emails" -> 8
+        m = _DIGITS_RE.search(value)
+        return int(m.group()) if m else default
     try:
-        if isinstance(value, str):
-            # Extract digits only, e.g. "8 emails" -> 8
-            digits = "".join(filter(str.isdigit, value))
-            if digits:
-                return int(digits)
-            return default
         return int(value)
     except Exception:
         return default
 
 
+def _parse_dt(s: str) -> datetime:
+    """Parse Graph's fixed "YYYY-MM-DDTHH:MM:SSZ" by slicing; anything else via fromisoformat."""
+    if len(s) == 20 and s[-1] == "Z":
+        return datetime(
+            int(s[0:4]), int(s[5:7]), int(s[8:10]),
+            int(s[11:13]), int(s[14:16]), int(s[17:19]),
+            tzinfo=timezone.utc,
+        )
+    if s.endswith("Z"):
+        return datetime.fromisoformat(s[:-1]).replace(tzinfo=timezone.utc)
+    return datetime.fromisoformat(s)
+
+
+def _score_message(msg: Dict[str, Any]) -> int:
+    """High importance 3, focused 2, unread 1; summed as ints, without branches."""
+    return (
+        3 * (msg.get("importance") == "high")
+        + 2 * (msg.get("inferenceClassification") == "focused")
+        + (not msg.get("isRead", True))
+    )
+
+
+# Follow-up questions about the inbox usually arrive within seconds of each other
+@ttl_cache(ttl_seconds=30)
+def _important_mails(max_emails_int: int, days_back_int: int) -> Dict[str, Any]:
+    """Fetch and rank recent mail; raises on HTTP errors so failures are not cached."""
+    _get_ms_access_token()  # also sets the session's Authorization header
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days_back_int)
+
+    params = {
+        **_GRAPH_PARAMS_BASE,
+        # Let Graph drop old and unremarkable mail; only rank the rest in Python.
+        # $orderby needs receivedDateTime to lead the $filter expression.
+        "$filter": (
+            f"receivedDateTime ge {cutoff:%Y-%m-%dT%H:%M:%SZ} and "
+            "(importance eq 'high' or inferenceClassification eq 'focused' "
+            "or isRead eq false)"
+        ),
+        "$top": str(max_emails_int * 3),
+    }
+
+    resp = _SESSION.get(_GRAPH_URL, params=params, timeout=10)
+    resp.raise_for_status()
+    data = resp.json()
+
+    messages: List[Dict[str, Any]] = data.get("value", [])
+
+    important: List[Tuple[Tuple[int, str], Dict[str, Any]]] = []
+    for msg in messages:
+        received_str = msg.get("receivedDateTime")
+        if not received_str:
+            continue
+
+        s = _score_message(msg)
+        # Fixed-width UTC strings sort chronologically as plain strings
+        received_key = received_str
+        if len(received_str) != 20 or received_str[-1] != "Z":
+            received_key = _parse_dt(received_str).astimezone(timezone.utc).strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
+            )
+
+        sender = (msg.get("from") or _EMPTY).get("emailAddress") or _EMPTY
+        email = {
+            "subject": msg.get("subject"),
+            "sender_name": sender.get("name"),
+            "sender_address": sender.get("address"),
+            "receivedDateTime": received_str,
+            "importance": msg.get("importance"),
+            "isRead": msg.get("isRead"),
+            "inferenceClassification": msg.get("inferenceClassification"),
+            "preview": msg.get("bodyPreview"),
+            "webLink": msg.get("webLink"),
+            "score": s,
+        }
+        important.append(((s, received_key), email))
+
+    # Top-k by score desc, then newest first
+    selected = [
+        m for _, m in heapq.nlargest(max_emails_int, important, key=lambda t: t[0])
+    ]
+
+    return {
+        "total_checked": len(messages),
+        "total_returned": len(selected),
+        "emails": selected,
+    }
+
+
 @tool
 def check_mails(
     max_emails: Union[int, str] = 8,
@@ -63,27 +167,8 @@ def check_mails(
     max_emails_int = _to_int_with_default(max_emails, default=8)
     days_back_int = _to_int_with_default(days_back, default=3)
 
-    access_token = _get_ms_access_token()
-
-    url = "https://graph.microsoft.com/v1.0/me/messages"
-    params = {
-        # Grab a reasonable batch and then score/filter in Python
-        "$top": "50",
-        "$orderby": "receivedDateTime desc",
-        "$select": (
-            "subject,from,receivedDateTime,importance,"
-            "isRead,inferenceClassification,bodyPreview,webLink"
-        ),
-    }
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Accept": "application/json",
-    }
-
     try:
-        resp = requests.get(url, headers=headers, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
+        return _important_mails(max_emails_int, days_back_int)
     except Exception as e:
         # Keep output structure, but signal error
         return {
@@ -92,72 +177,3 @@ def check_mails(
             "emails": [],
             "error": f"Failed to fetch emails: {str(e)}",
         }
-
-    messages: List[Dict[str, Any]] = data.get("value", [])
-    now = datetime.now(timezone.utc)
-    cutoff = now - timedelta(days=days_back_int)
-
-    def parse_dt(dt_str: str) -> datetime:
-        # Graph returns ISO 8601, e.g. "2025-11-18T13:08:00Z"
-        return datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
-
-    def score_message(msg: Dict[str, Any]) -> int:
-        s = 0
-        if msg.get("importance") == "high":
-            s += 3
-        if msg.get("inferenceClassification") == "focused":
-            s += 2
-        if not msg.get("isRead", True):
-            s += 1
-        return s
-
-    important: List[Dict[str, Any]] = []
-    for msg in messages:
-        received_str = msg.get("receivedDateTime")
-        if not received_str:
-            continue
-
-        try:
-            received_dt = parse_dt(received_str)
-        except Exception:
-            continue
-
-        if received_dt < cutoff:
-            continue
-
-        s = score_message(msg)
-        if s <= 0:
-            # Ignore totally unremarkable, old, read, low-importance stuff
-            continue
-
-        sender = (msg.get("from") or {}).get("emailAddress") or {}
-        important.append(
-            {
-                "subject": msg.get("subject"),
-                "sender_name": sender.get("name"),
-                "sender_address": sender.get("address"),
-                "receivedDateTime": received_str,
-                "importance": msg.get("importance"),
-                "isRead": msg.get("isRead"),
-                "inferenceClassification": msg.get("inferenceClassification"),
-                "preview": msg.get("bodyPreview"),
-                "webLink": msg.get("webLink"),
-                "score": s,
-            }
-        )
-
-    # Sort: score desc, then newest first
-    important.sort(
-        key=lambda m: (
-            -m["score"],
-            m["receivedDateTime"] or "",
-        )
-    )
-
-    selected = important[:max_emails_int]
-
-    return {
-        "total_checked": len(messages),
-        "total_returned": len(selected),
-        "emails": selected,
-    }
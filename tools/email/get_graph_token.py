@@ -1,53 +1,95 @@
+import atexit
 import os
 import json
-import msal
+import threading
+import time
+from typing import Optional
 from dotenv import load_dotenv
+from tools.http_session import build_session
 
 load_dotenv()
 TOKEN_CACHE_PATH = os.getenv("OUTLOOK_TOKEN_PATH")
+CLIENT_ID = os.getenv("OUTLOOK_API")
+AUTHORITY = "https://login.microsoftonline.com/consumers"
+SCOPES = ["Mail.Read"]
 
+# Keep-alive session for Microsoft Graph; carries the current bearer token
+_SESSION = build_session()
+_SESSION.headers["Accept"] = "application/json"
 
-def _get_ms_access_token():
-    CLIENT_ID = os.getenv("OUTLOOK_API")
-    AUTHORITY = "https://login.microsoftonline.com/consumers"
-    SCOPES = ["Mail.Read"]
-
-    # ---- load or create token cache ----
-    cache = msal.SerializableTokenCache()
-    if os.path.exists(TOKEN_CACHE_PATH):
-        with open(TOKEN_CACHE_PATH, "r", encoding="utf-8") as f:
-            cache.deserialize(f.read())
-
-    app = msal.PublicClientApplication(
-        CLIENT_ID,
-        authority=AUTHORITY,
-        token_cache=cache,
-    )
-
-    # ---- try silent token first ----
-    result = None
-    accounts = app.get_accounts()
-    if accounts:
-        result = app.acquire_token_silent(SCOPES, account=accounts[0])
-
-    # ---- if no valid token, do device code flow ----
-    if not result:
-        flow = app.initiate_device_flow(scopes=SCOPES)
-        if "user_code" not in flow:
-            raise RuntimeError(f"Failed to create device flow: {flow}")
-
-        print("Go to:", flow["verification_uri"])
-        print("Code:", flow["user_code"])
-        input("Press Enter here AFTER signing in and accepting...\n")
-
-        result = app.acquire_token_by_device_flow(flow)
-
-    if "access_token" not in result:
-        raise RuntimeError(f"Failed to acquire token: {json.dumps(result, indent=2)}")
-
-    # ---- persist cache if changed ----
-    if cache.has_state_changed:
+# msal app and token cache are built once; msal serves valid tokens from memory
+_APP = None
+_CACHE = None
+_TOKEN_LOCK = threading.Lock()
+
+# Last access token and when it expires (time.time()); reused until a minute before
+_ACCESS_TOKEN: Optional[str] = None
+_TOKEN_EXPIRY = 0.0
+
+
+def _persist_cache() -> None:
+    """Write the msal token cache back to disk if it changed."""
+    if _CACHE is not None and _CACHE.has_state_changed:
         with open(TOKEN_CACHE_PATH, "w", encoding="utf-8") as f:
-            f.write(cache.serialize())
+            f.write(_CACHE.serialize())
+
+
+def _persist_cache_at_exit() -> None:
+    with _TOKEN_LOCK:
+        _persist_cache()
+
+
+atexit.register(_persist_cache_at_exit)
+
+
+def _get_ms_access_token():
+    global _APP, _CACHE, _ACCESS_TOKEN, _TOKEN_EXPIRY
+    with _TOKEN_LOCK:
+        if _ACCESS_TOKEN and time.time() < _TOKEN_EXPIRY - 60:
+            return _ACCESS_TOKEN
+
+        # ---- load token cache and app once per process ----
+        if _APP is None:
+            import msal  # deferred until mail is actually read
+
+            _CACHE = msal.SerializableTokenCache()
+            if os.path.exists(TOKEN_CACHE_PATH):
+                with open(TOKEN_CACHE_PATH, "r", encoding="utf-8") as f:
+                    _CACHE.deserialize(f.read())
+
+            _APP = msal.PublicClientApplication(
+                CLIENT_ID,
+                authority=AUTHORITY,
+                token_cache=_CACHE,
+            )
+
+        # ---- try silent token first ----
+        result = None
+        accounts = _APP.get_accounts()
+        if accounts:
+            result = _APP.acquire_token_silent(SCOPES, account=accounts[0])
+
+        # ---- if no valid token, do device code flow ----
+        signed_in = not result
+        if signed_in:
+            flow = _APP.initiate_device_flow(scopes=SCOPES)
+            if "user_code" not in flow:
+                raise RuntimeError(f"Failed to create device flow: {flow}")
+
+            print("Go to:", flow["verification_uri"])
+            print("Code:", flow["user_code"])
+            input("Press Enter here AFTER signing in and accepting...\n")
+
+            result = _APP.acquire_token_by_device_flow(flow)
+
+        if "access_token" not in result:
+            raise RuntimeError(f"Failed to acquire token: {json.dumps(result, indent=2)}")
+
+        # ---- persist a new sign-in right away; silent refreshes are written at exit ----
+        if signed_in:
+            _persist_cache()
 
-    return result["access_token"]
+        _ACCESS_TOKEN = result["access_token"]
+        _TOKEN_EXPIRY = time.time() + int(result.get("expires_in", 0))
+        _SESSION.headers["Authorization"] = f"Bearer {_ACCESS_TOKEN}"
+        return _ACCESS_TOKEN
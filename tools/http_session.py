@@ -0,0 +1,84 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+# Transient throttling / gateway errors are retried with exponential backoff.
+# Only idempotent methods are retried on a status: a POST that reached the
+# server may already have created an event. Connection errors are retried for
+# all methods, since the request never left the client.
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.2,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+    raise_on_status=False,
+)
+
+
+def build_session(pool_connections: int = 8, pool_maxsize: int = 32) -> requests.Session:
+    """
+    Create a requests.Session with a keep-alive connection pool, so repeated
+    tool calls to the same API host reuse their TCP/TLS connection.
+
+    The pool is sized for parallel tool threads, so concurrent calls don't
+    queue behind each other for a connection.
+    """
+    session = requests.Session()
+    session.headers["Connection"] = "keep-alive"
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=_RETRY,
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+# Validators and parsed result of the last 200 response, per conditional_get key
+_VALIDATED: Dict[Hashable, Tuple[Optional[str], Optional[str], Any]] = {}
+_VALIDATED_LOCK = threading.Lock()
+
+
+def conditional_get(
+    session: requests.Session,
+    url: str,
+    parse: Callable[[requests.Response], Any],
+    key: Optional[Hashable] = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    GET `url` and return `parse(response)`, revalidating against the last fetch.
+
+    The previous response's ETag / Last-Modified are sent as If-None-Match /
+    If-Modified-Since; on 304 Not Modified the previously parsed result is
+    returned without downloading or parsing the body again. `key` separates
+    results that parse the same URL differently (defaults to the URL).
+    Treat the returned object as read-only, it may be shared between calls.
+    """
+    key = url if key is None else key
+    with _VALIDATED_LOCK:
+        entry = _VALIDATED.get(key)
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if entry is not None:
+        etag, last_modified, _ = entry
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    with session.get(url, headers=headers, **kwargs) as resp:
+        if resp.status_code == 304 and entry is not None:
+            return entry[2]
+        resp.raise_for_status()
+        result = parse(resp)
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+
+    if etag or last_modified:
+        with _VALIDATED_LOCK:
+            _VALIDATED[key] = (etag, last_modified, result)
+    return result
@@ -1,24 +1,29 @@
 import re
-import requests
-from bs4 import BeautifulSoup
+from html import unescape
 from urllib.parse import urljoin
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Optional, Union
 
 from smolagents import tool
+from requests import Response
+from tools.http_session import build_session, conditional_get
+from tools.ttl_cache import ttl_cache
 
 URL = "https://finviz.com/news.ashx"
 
-# Matches either:
-#  - "08:06AM"
-#  - "Nov-20"
-TS_RE = re.compile(
-    r"(?P<ts>(\d{1,2}:\d{2}[AP]M|[A-Z][a-z]{2}-\d{2}))\s+(?P<title>.+?)\s+\S+$"
-)
+_DIGITS_RE = re.compile(r"\d+")
 
+# One news row: timestamp cell, then the first external link in the same <tr>
+_ROW_RE = re.compile(
+    r"<td[^>]*>\s*(?P<ts>\d{1,2}:\d{2}[AP]M|[A-Z][a-z]{2}-\d{2})\s*</td>"
+    r"(?:(?!</tr>).)*?"
+    r"<a\s[^>]*?href=\"(?P<url>https?://[^\"]+)\"[^>]*>\s*(?P<title>[^<]+?)\s*</a>",
+    re.DOTALL,
+)
 
-def _scrape_finviz_news() -> List[Dict[str, Any]]:
-    """Low-level HTML scraper, returns raw items (no slicing)."""
-    headers = {
+# Keep-alive session for Finviz, sending browser-like headers on every request
+_SESSION = build_session()
+_SESSION.headers.update(
+    {
         "User-Agent": (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
             "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -27,24 +32,58 @@ def _scrape_finviz_news() -> List[Dict[str, Any]]:
         "Accept-Language": "en-US,en;q=0.9",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     }
-    resp = requests.get(URL, headers=headers, timeout=15)
-    resp.raise_for_status()
+)
 
-    html = resp.text
 
-    # --- 1) Detect if Cloudflare / JS challenge instead of real content ---
-    lower_html = html.lower()
-    if "cloudflare" in lower_html and (
-        "attention required" in lower_html or "please enable javascript" in lower_html
-    ):
-        raise RuntimeError(
-            "Got a Cloudflare/JS challenge page instead of Finviz news. "
-            "You may need to use a browser automation tool (e.g. Playwright / "
-            "Selenium) or an 'undetected' HTTP client."
+def _parse_ts_prefix(text: str) -> Optional[str]:
+    """
+    Return the leading Finviz timestamp of a row's text, or None.
+
+    Rows look like "<ts> <title> <domain>", where ts is either a time
+    ("08:06AM", "8:06AM") or a date ("Nov-20"). Checked by position instead
+    of with a regex, since this runs for every link on the page.
+    """
+    if text[2:3] == ":":
+        end = 7  # "08:06AM"
+    elif text[1:2] == ":" or text[3:4] == "-":
+        end = 6  # "8:06AM" / "Nov-20"
+    else:
+        return None
+
+    ts, rest = text[:end], text[end:]
+    if ts[-5:-4] == ":":
+        ok = ts[:-5].isdigit() and ts[-4:-2].isdigit() and ts[-2:] in ("AM", "PM")
+    else:
+        ok = ts[0].isupper() and ts[1:3].isalpha() and ts[1:3].islower() and ts[4:].isdigit()
+
+    # After the timestamp there must be a title and a trailing domain
+    if ok and len(ts) == end and rest[:1].isspace() and len(rest.split(None, 1)) == 2:
+        return ts
+    return None
+
+
+def _parse_rows_regex(html: str) -> List[Dict[str, Any]]:
+    """Fast path: pull (timestamp, url, title) straight out of the raw news table HTML."""
+    items: List[Dict[str, Any]] = []
+    for m in _ROW_RE.finditer(html):
+        url = unescape(m.group("url"))
+        if "finviz.com" in url:
+            continue
+        items.append(
+            {
+                "date_or_time": m.group("ts"),
+                "title": unescape(m.group("title")).strip(),
+                "url": url,
+            }
         )
+    return items
+
+
+def _parse_rows_soup(html: str) -> List[Dict[str, Any]]:
+    """Slow path: walk every external link in the DOM and read its row's timestamp."""
+    from bs4 import BeautifulSoup  # only needed when the regex finds nothing
 
-    # --- 2) Parse with BeautifulSoup ---
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml")
 
     items: List[Dict[str, Any]] = []
 
@@ -70,18 +109,17 @@ def _scrape_finviz_news() -> List[Dict[str, Any]]:
         # "08:06AM U.S. dollar registers six-month high before retreat www.marketwatch.com"
         row_text = row.get_text(" ", strip=True)
 
-        m = TS_RE.match(row_text)
-        if not m:
+        ts = _parse_ts_prefix(row_text)
+        if ts is None:
             # Sometimes the direct parent might be too narrow; try grandparent as fallback
             gp = row.parent
             if gp is not None:
                 row_text2 = gp.get_text(" ", strip=True)
-                m = TS_RE.match(row_text2)
+                ts = _parse_ts_prefix(row_text2)
 
-        if not m:
+        if ts is None:
             continue
 
-        ts = m.group("ts")
         # Title from the <a>, not from the regex, to avoid including domain
         title = link.get_text(" ", strip=True)
 
@@ -98,6 +136,31 @@ def _scrape_finviz_news() -> List[Dict[str, Any]]:
     return items
 
 
+@ttl_cache(ttl_seconds=120)
+def _scrape_finviz_news() -> List[Dict[str, Any]]:
+    """Low-level HTML scraper, returns raw items (no slicing)."""
+    return conditional_get(_SESSION, URL, _parse_finviz_page, timeout=15)
+
+
+def _parse_finviz_page(resp: Response) -> List[Dict[str, Any]]:
+    """Turn a fetched Finviz news page into items, rejecting challenge pages."""
+    html = resp.text
+
+    # --- 1) Detect if Cloudflare / JS challenge instead of real content ---
+    lower_html = html.lower()
+    if "cloudflare" in lower_html and (
+        "attention required" in lower_html or "please enable javascript" in lower_html
+    ):
+        raise RuntimeError(
+            "Got a Cloudflare/JS challenge page instead of Finviz news. "
+            "You may need to use a browser automation tool (e.g. Playwright / "
+            "Selenium) or an 'undetected' HTTP client."
+        )
+
+    # --- 2) Parse: one regex pass over the news table, DOM walk if the markup changed ---
+    return _parse_rows_regex(html) or _parse_rows_soup(html)
+
+
 @tool
 def get_financial_market_updates(num_news: Union[int, str] = 20) -> Dict[str, Any]:
     """
@@ -116,15 +179,15 @@ def get_financial_market_updates(num_news: Union[int, str] = 20) -> Dict[str, An
             - optional "error" key if scraping fails.
     """
     # --- Lenient argument handling (same pattern as check_mails) ---
-    try:
-        if isinstance(num_news, str):
-            # Extract digits only, e.g. "20 news" -> 20
-            digits = "".join(filter(str.isdigit, num_news))
-            num_news_int = int(digits) if digits else 20
-        else:
+    if isinstance(num_news, str):
+        # First number only, e.g. "20 news" -> 20
+        m = _DIGITS_RE.search(num_news)
+        num_news_int = int(m.group()) if m else 20
+    else:
+        try:
             num_news_int = int(num_news)
-    except Exception:
-        num_news_int = 20
+        except Exception:
+            num_news_int = 20
     # --------------------------------------------------------------
 
     try:
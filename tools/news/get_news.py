@@ -1,26 +1,84 @@
 from smolagents import tool
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, Dict, Any, List, Union
-import requests
 import xml.etree.ElementTree as ET
-import trafilatura
 from dotenv import load_dotenv
 import os
+import re
+from types import MappingProxyType
+from requests import Response
+from tools.http_session import build_session, conditional_get
+from tools.ttl_cache import ttl_cache
 
 load_dotenv()
 SERPER_API_KEY = os.getenv("SERPER_API_KEY")
 
+GOOGLE_NEWS_RSS_URL = "https://news.google.com/rss"
+SERPER_NEWS_URL = "https://google.serper.dev/news"
+SERPER_SEARCH_URL = "https://google.serper.dev/search"
+_SERPER_HEADERS = MappingProxyType(
+    {"X-API-KEY": SERPER_API_KEY or "", "Content-Type": "application/json"}
+)
+_SERPER_SEARCH_BASE = MappingProxyType({"gl": "us", "hl": "en"})
+_SERPER_NEWS_BASE = MappingProxyType({**_SERPER_SEARCH_BASE, "tbs": "qdr:d"})
+
+_DIGITS_RE = re.compile(r"\d+")
+
+# Keep-alive session shared by the Google News and Serper calls
+_SESSION = build_session()
+
+# Article sites tend to block obvious non-browser clients
+_ARTICLE_HEADERS = MappingProxyType(
+    {
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/120.0.0.0 Safari/537.36"
+        ),
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    }
+)
+
+# Independent fetches (e.g. world + local headlines) overlap their round trips
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="news")
+
+
+def _coerce_int(value: Union[int, str, float], default: int) -> int:
+    """Coerce common LLM outputs into an int, e.g. "5 headlines" -> 5."""
+    if isinstance(value, str):
+        m = _DIGITS_RE.search(value)
+        return int(m.group()) if m else default
+    try:
+        return int(value)
+    except Exception:
+        return default
+
 
+@ttl_cache(ttl_seconds=600)
 def _fetch_google_news_rss(num: int = 5) -> List[Dict[str, Any]]:
     """Fetch general news from Google News RSS feed."""
-    url = "https://news.google.com/rss"
-    r = requests.get(url, timeout=30)
-    r.raise_for_status()
+    if num <= 0:
+        return []
+
+    return conditional_get(
+        _SESSION,
+        GOOGLE_NEWS_RSS_URL,
+        lambda r: _parse_rss_items(r, num),
+        key=(GOOGLE_NEWS_RSS_URL, num),
+        stream=True,
+        timeout=30,
+    )
 
-    root = ET.fromstring(r.content)
-    items = root.findall(".//item")
 
+def _parse_rss_items(r: Response, num: int) -> List[Dict[str, Any]]:
+    """Parse while downloading and stop after `num` items instead of building the whole feed."""
     results: List[Dict[str, Any]] = []
-    for item in items[:num]:
+    r.raw.decode_content = True  # let urllib3 undo gzip Content-Encoding
+
+    for _, item in ET.iterparse(r.raw, events=("end",)):
+        if item.tag != "item":
+            continue
+
         title = item.find("title")
         link = item.find("link")
         pub_date = item.find("pubDate")
@@ -34,18 +92,20 @@ def _fetch_google_news_rss(num: int = 5) -> List[Dict[str, Any]]:
                 "source": source.text if source is not None else "Google News",
             }
         )
+        item.clear()
+        if len(results) >= num:
+            break
     return results
 
 
+@ttl_cache(ttl_seconds=600)
 def _serper_news_search(query: str, num: int = 5) -> List[Dict[str, Any]]:
     """Fetch news for a specific topic or query via Serper."""
     if not SERPER_API_KEY:
         raise ValueError("SERPER_API_KEY env var is not set.")
 
-    url = "https://google.serper.dev/news"
-    headers = {"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"}
-    payload = {"q": query, "gl": "us", "hl": "en", "tbs": "qdr:d"}
-    r = requests.post(url, headers=headers, json=payload, timeout=30)
+    payload = {**_SERPER_NEWS_BASE, "q": query}
+    r = _SESSION.post(SERPER_NEWS_URL, headers=_SERPER_HEADERS, json=payload, timeout=30)
     r.raise_for_status()
     data = r.json()
 
@@ -63,15 +123,14 @@ def _serper_news_search(query: str, num: int = 5) -> List[Dict[str, Any]]:
     return results
 
 
+@ttl_cache(ttl_seconds=600)
 def _serper_site_search(query: str, site: str, num: int = 5) -> List[Dict[str, Any]]:
     """Site restricted web search via Serper."""
     if not SERPER_API_KEY:
         raise ValueError("SERPER_API_KEY env var is not set.")
 
-    url = "https://google.serper.dev/search"
-    headers = {"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"}
-    payload = {"q": f"site:{site} {query}", "gl": "us", "hl": "en"}
-    r = requests.post(url, headers=headers, json=payload, timeout=30)
+    payload = {**_SERPER_SEARCH_BASE, "q": f"site:{site} {query}"}
+    r = _SESSION.post(SERPER_SEARCH_URL, headers=_SERPER_HEADERS, json=payload, timeout=30)
     r.raise_for_status()
     data = r.json()
 
@@ -90,10 +149,14 @@ def _serper_site_search(query: str, site: str, num: int = 5) -> List[Dict[str, A
 
 def _fetch_article(url: str, max_chars: int = 12000) -> Dict[str, Any]:
     """Fetch and extract clean article text with trafilatura."""
-    downloaded = trafilatura.fetch_url(url, timeout=30)
-    text = (
-        trafilatura.extract(downloaded, include_comments=False) if downloaded else None
-    )
+    import trafilatura  # heavy; only article requests pay for it
+
+    resp = _SESSION.get(url, headers=_ARTICLE_HEADERS, timeout=30)
+    resp.raise_for_status()
+    # Raw bytes: trafilatura detects the charset itself, whereas resp.text
+    # falls back to ISO-8859-1 for "text/html" without one and garbles UTF-8.
+    # fast=True skips trafilatura's slower fallback extractors
+    text = trafilatura.extract(resp.content, include_comments=False, fast=True)
     if not text:
         return {"ok": False, "error": "could_not_extract"}
 
@@ -152,35 +215,9 @@ def news_report(
     """
 
     # --- Lenient argument handling (same style as check_mails) ---
-    # world_num
-    try:
-        if isinstance(world_num, str):
-            digits = "".join(filter(str.isdigit, world_num))
-            world_num_int = int(digits) if digits else 5
-        else:
-            world_num_int = int(world_num)
-    except Exception:
-        world_num_int = 5
-
-    # local_num
-    try:
-        if isinstance(local_num, str):
-            digits = "".join(filter(str.isdigit, local_num))
-            local_num_int = int(digits) if digits else 5
-        else:
-            local_num_int = int(local_num)
-    except Exception:
-        local_num_int = 5
-
-    # max_chars
-    try:
-        if isinstance(max_chars, str):
-            digits = "".join(filter(str.isdigit, max_chars))
-            max_chars_int = int(digits) if digits else 12000
-        else:
-            max_chars_int = int(max_chars)
-    except Exception:
-        max_chars_int = 12000
+    world_num_int = _coerce_int(world_num, 5)
+    local_num_int = _coerce_int(local_num, 5)
+    max_chars_int = _coerce_int(max_chars, 12000)
 
     # as_article (accept "true"/"false"/"1"/"0" etc)
     if isinstance(as_article, str):
@@ -231,15 +268,27 @@ def news_report(
                 "reason": "no_results",
             }
 
-        best = candidates[0]  # keep it simple: first result
-        link = best.get("link")
-        if link:
+        # Fetch all candidates at once; keep the best-ranked one that extracts,
+        # so a paywalled top hit costs no extra round trip
+        best = candidates[0]
+        article: Dict[str, Any] = {"ok": False, "error": "no_link_in_result"}
+        fetches = [
+            (cand, _EXECUTOR.submit(_fetch_article, cand["link"], max_chars=max_chars_int))
+            for cand in candidates
+            if cand.get("link")
+        ]
+        for rank, (cand, future) in enumerate(fetches):
             try:
-                article = _fetch_article(link, max_chars=max_chars_int)
+                fetched = future.result()
             except Exception as e:
-                article = {"ok": False, "error": f"fetch_failed: {str(e)}"}
-        else:
-            article = {"ok": False, "error": "no_link_in_result"}
+                fetched = {"ok": False, "error": f"fetch_failed: {str(e)}"}
+            if rank == 0 or fetched.get("ok"):
+                best, article = cand, fetched
+            if fetched.get("ok"):
+                break
+        for _, future in fetches:
+            future.cancel()
+        link = best.get("link")
 
         return {
             "mode": "article",
@@ -269,26 +318,27 @@ def news_report(
         }
 
     # 4) Default: daily brief (world + local)
-    world: List[Dict[str, Any]] = []
-    local: List[Dict[str, Any]] = []
+    headlines: Dict[str, List[Dict[str, Any]]] = {"world": [], "local": []}
     errors: Dict[str, str] = {}
 
-    try:
-        world = _fetch_google_news_rss(num=world_num_int)
-    except Exception as e:
-        errors["world"] = str(e)
-
     local_query = f"{location} news" if location else "local news"
-    try:
-        local = _serper_news_search(query=local_query, num=local_num_int)
-    except Exception as e:
-        errors["local"] = str(e)
+    futures = {
+        _EXECUTOR.submit(_fetch_google_news_rss, num=world_num_int): "world",
+        _EXECUTOR.submit(
+            _serper_news_search, query=local_query, num=local_num_int
+        ): "local",
+    }
+    for future in as_completed(futures):
+        try:
+            headlines[futures[future]] = future.result()
+        except Exception as e:
+            errors[futures[future]] = str(e)
 
     result: Dict[str, Any] = {
         "mode": "daily_brief",
         "location": location,
-        "world": world,
-        "local": local,
+        "world": headlines["world"],
+        "local": headlines["local"],
     }
     if errors:
         result["errors"] = errors
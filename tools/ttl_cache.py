@@ -0,0 +1,51 @@
+import copy
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def ttl_cache(
+    ttl_seconds: float,
+    maxsize: int = 64,
+    cache_if: Optional[Callable[[Any], bool]] = None,
+) -> Callable:
+    """
+    Memoize a function's results for `ttl_seconds`, keyed by its arguments.
+
+    Thread-safe, so tools running in parallel share one cache. Results are
+    deep-copied on the way out so callers can modify them freely; exceptions
+    are never cached, and neither are results rejected by `cache_if`.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        cache: Dict[Hashable, Tuple[float, Any]] = {}
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with lock:
+                hit = cache.get(key)
+            if hit is not None and hit[0] > now:
+                return copy.deepcopy(hit[1])
+
+            result = func(*args, **kwargs)
+            if cache_if is not None and not cache_if(result):
+                return result
+
+            with lock:
+                if len(cache) >= maxsize:
+                    # Drop expired entries first, then the oldest remaining one
+                    for stale in [k for k, (expires, _) in cache.items() if expires <= now]:
+                        del cache[stale]
+                    if len(cache) >= maxsize:
+                        cache.pop(next(iter(cache)))
+                cache[key] = (now + ttl_seconds, result)
+            return copy.deepcopy(result)
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
@@ -1,45 +1,169 @@
 from smolagents import tool
-from typing import Optional, Dict, Any, Union
-from datetime import datetime, date as Date
-import requests
+from typing import Optional, Dict, Any, List, Sequence, Tuple, TypedDict, Union
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date as Date
+from functools import lru_cache
 from dotenv import load_dotenv
 import os
+import re
+from tools.http_session import build_session
+from tools.ttl_cache import ttl_cache
 
-load_dotenv()
-WEATHER_API_KEY = os.getenv("GOOGLE_WEATHER_API")
+WEATHER_URL = "https://weather.googleapis.com/v1/forecast/hours:lookup"
+GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+
+# Shared keep-alive session for the Geocoding and Weather API hosts
+_SESSION = build_session()
+
+# get_weather_batch runs its geocodes and lookups concurrently
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="weather")
+
+# Coordinates of a place practically never change
+GEOCODE_TTL_SECONDS = 7 * 24 * 3600
+GEOCODE_MISS_TTL_SECONDS = 60
+# ~11 m, far finer than the forecast grid
+COORD_DECIMALS = 4
+# Forecast hours fetched for today and tomorrow, incl. one day of slack
+SHORT_HORIZON_HOURS = 72
+# Repeated questions about the same place/date/hour within this window reuse the answer
+WEATHER_RESULT_TTL_SECONDS = 900
+
+
+class WeatherResult(TypedDict, total=False):
+    """
+    Successful get_weather payload. The tools themselves stay annotated as
+    Dict[str, Any], since smolagents builds their schemas from the hints.
+    """
+
+    location: str
+    latitude: float
+    longitude: float
+    date: str
+    hour: Optional[int]
+    utcOffset: Optional[str]
+    description: Optional[str]
+    icon: Optional[str]
+    temperature: Optional[float]
+    temperatureUnit: Optional[str]
+    precipitationProbabilityPercent: Optional[int]
+
+
+@lru_cache(maxsize=1)
+def _load_env() -> None:
+    # Read .env on first use instead of at import
+    load_dotenv()
+
+
+def _get_api_key() -> Optional[str]:
+    """
+    Return the Google Weather/Geocoding API key.
+
+    Read from the environment on each call, so a key set after import is
+    picked up.
+    """
+    _load_env()
+    return os.getenv("GOOGLE_WEATHER_API")
+
+
+def _norm_loc(location: str) -> str:
+    """
+    Normalize a location for cache keys: casefolded, whitespace collapsed.
+    """
+    return " ".join(str(location).casefold().split())
+
+
+def _is_success(result: Dict[str, Any]) -> bool:
+    return "error" not in result
+
+
+def _is_error(result: Dict[str, Any]) -> bool:
+    return "error" in result
 
 
 def _geocode_location(location: str) -> Dict[str, float]:
     """
     Resolve a human-readable location to latitude/longitude using
     the Google Geocoding API.
+
+    Lookups are cached per normalized location, so "Vienna, Austria" and
+    "vienna,  austria" share one API call. Places the API can't find are
+    remembered briefly too, so an agent retrying a bad location doesn't
+    hit the API each time.
     """
-    url = "https://maps.googleapis.com/maps/api/geocode/json"
-    params = {"address": location, "key": WEATHER_API_KEY}
+    result = _geocode_normalized(_norm_loc(location))
+    if "error" in result:
+        raise ValueError(result["error"])
+    return result
+
 
-    resp = requests.get(url, params=params, timeout=10)
+# Found places are kept for a week; misses only for a minute, so a
+# transient API hiccup heals itself. HTTP errors are never cached.
+@ttl_cache(ttl_seconds=GEOCODE_TTL_SECONDS, maxsize=256, cache_if=_is_success)
+@ttl_cache(ttl_seconds=GEOCODE_MISS_TTL_SECONDS, maxsize=256, cache_if=_is_error)
+def _geocode_normalized(location: str) -> Dict[str, Any]:
+    params = {"address": location, "key": _get_api_key()}
+
+    resp = _SESSION.get(GEOCODE_URL, params=params, timeout=10)
     resp.raise_for_status()
     data = resp.json()
 
     if data.get("status") != "OK" or not data.get("results"):
-        raise ValueError(f"Could not geocode location: {location!r}")
+        return {"error": f"Could not geocode location: {location!r}"}
 
     loc = data["results"][0]["geometry"]["location"]
     return {"lat": loc["lat"], "lng": loc["lng"]}
 
 
-def _extract_date_str(raw: Union[str, Dict[str, Any]]) -> str:
+@ttl_cache(ttl_seconds=300)
+def _fetch_forecast_by_date(
+    lat: float, lng: float, hours: int = 240
+) -> Dict[Tuple[int, int, int], List[Dict[str, Any]]]:
     """
-    Normalize date input into 'YYYY-MM-DD'.
+    Fetch the next `hours` hours of the Google Weather forecast (at most
+    240, ~10 days) for the coordinates, grouped by local (year, month, day)
+    so a lookup jumps straight to the ~24 hours of its date.
+    """
+    params = {
+        "key": _get_api_key(),
+        "location.latitude": lat,
+        "location.longitude": lng,
+        "hours": hours,
+        "pageSize": hours,  # avoid pagination
+    }
 
-    Accepts:
-    - simple string: '2025-12-05' or '2025-12-05T14:00:00'
-    - dicts from other tools, e.g.
-      {'date': '2025-12-05'} or
-      {'iso_datetime': '2025-12-05T14:00:00+01:00'}
+    resp = _SESSION.get(WEATHER_URL, params=params, timeout=10)
+    resp.raise_for_status()
+
+    by_date: Dict[Tuple[int, int, int], List[Dict[str, Any]]] = defaultdict(list)
+    for fh in resp.json().get("forecastHours", []):
+        dd = fh.get("displayDateTime")
+        if dd and dd.get("hours") is not None:
+            by_date[(dd.get("year"), dd.get("month"), dd.get("day"))].append(fh)
+    return dict(by_date)
+
+
+# Leading "YYYY-MM-DD" with an optional "THH:MM" / " HH:MM"
+_DT_RE = re.compile(r"(\d{4}-\d{2}-\d{2})(?:[T ](\d{1,2}):(\d{2}))?")
+# A complete "YYYY-MM-DD", nothing else
+_DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})$")
+# Leading hour of a bare "HH:MM[:SS]" or "HH"
+_HOUR_RE = re.compile(r"(\d{1,2})(?::|$)")
+
+_DATE_KEYS = ("date", "iso_datetime", "datetime", "iso")
+_TIME_KEYS = ("time", "iso_datetime", "datetime", "iso")
+
+
+def _as_str(raw: Union[str, Dict[str, Any], None], keys: Sequence[str]) -> str:
     """
+    Return `raw` as a stripped string; for dicts from other tools, the first
+    non-empty string value among `keys`.
+    """
+    if raw is None:
+        return ""
+
     if isinstance(raw, dict):
-        for key in ("date", "iso_datetime", "datetime", "iso"):
+        for key in keys:
             val = raw.get(key)
             if isinstance(val, str) and val.strip():
                 raw = val
@@ -47,9 +171,23 @@ def _extract_date_str(raw: Union[str, Dict[str, Any]]) -> str:
         else:
             raw = ""
 
-    s = str(raw).strip()
-    if not s:
-        return ""
+    return str(raw).strip()
+
+
+def _extract_date_str(raw: Union[str, Dict[str, Any]]) -> str:
+    """
+    Normalize date input into 'YYYY-MM-DD'.
+
+    Accepts:
+    - simple string: '2025-12-05' or '2025-12-05T14:00:00'
+    - dicts from other tools, e.g.
+      {'date': '2025-12-05'} or
+      {'iso_datetime': '2025-12-05T14:00:00+01:00'}
+    """
+    s = _as_str(raw, _DATE_KEYS)
+    m = _DT_RE.match(s)
+    if m:
+        return m[1]
 
     if "T" in s:
         s = s.split("T", 1)[0]
@@ -64,32 +202,34 @@ def _extract_hour(raw: Union[str, Dict[str, Any], None]) -> Optional[int]:
     - "2025-12-05T14:30:00"
     - dicts with 'time' or 'iso_datetime'.
     """
-    if raw is None:
-        return None
+    s = _as_str(raw, _TIME_KEYS)
 
-    if isinstance(raw, dict):
-        for key in ("time", "iso_datetime", "datetime", "iso"):
-            val = raw.get(key)
-            if isinstance(val, str) and val.strip():
-                raw = val
-                break
-        else:
-            raw = ""
+    m = _DT_RE.match(s)
+    if m:
+        # A bare date carries no hour
+        return int(m[2]) if m[2] else None
 
-    s = str(raw).strip()
-    if not s:
-        return None
+    m = _HOUR_RE.match(s)
+    return int(m[1]) if m else None
 
-    # If full datetime, take part after 'T'
-    if "T" in s:
-        s = s.split("T", 1)[1]
 
-    # Now expect "HH:MM[:SS]"
+@lru_cache(maxsize=1024)
+def _parse_target(date_str: str, time_str: str) -> Tuple[Optional[Date], Optional[int]]:
+    """
+    Parse normalized date/time strings into (target date, hour or None).
+
+    The date is None if `date_str` is not a valid 'YYYY-MM-DD'. Agents ask
+    about the same few dates over and over, so results are memoized.
+    """
+    m = _DATE_RE.match(date_str)
+    if m is None:
+        return None, None
     try:
-        hour_str = s.split(":", 1)[0]
-        return int(hour_str)
-    except Exception:
-        return None
+        # Still rejects impossible days such as 2025-02-30
+        target_date = Date(int(m[1]), int(m[2]), int(m[3]))
+    except ValueError:
+        return None, None
+    return target_date, _extract_hour(time_str)
 
 
 @tool
@@ -125,9 +265,60 @@ def get_weather(
         or:
           {"error": "..."} if something goes wrong.
     """
-    units: str = "METRIC"
+    return _get_weather(location, date, time)
+
+
+@tool
+def get_weather_batch(queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Get Google Weather forecasts for several places and/or dates at once.
+
+    Use this instead of repeated get_weather calls when the user asks about
+    more than one place or date (e.g. "weather in Vienna, Graz and Linz on
+    Friday").
+
+    Args:
+        queries:
+            List of query dicts with the same fields as get_weather:
+            "location" and "date" (required), plus optional "time".
+
+    Returns:
+        list with one dict per query, in the same order, shaped like the
+        get_weather result (or {"error": "...", ...} for that query).
+    """
+    queries = [q if isinstance(q, dict) else {} for q in queries]
+
+    # Geocode each distinct place once up front, so queries for the same
+    # place share one lookup via the geocode cache instead of racing it
+    locations = {_norm_loc(q["location"]) for q in queries if q.get("location")}
+    for _ in _EXECUTOR.map(_try_geocode, locations):
+        pass
+
+    return list(
+        _EXECUTOR.map(
+            lambda q: _get_weather(q.get("location", ""), q.get("date"), q.get("time")),
+            queries,
+        )
+    )
+
+
+def _try_geocode(location: str) -> None:
+    # Failures are reported by the per-query lookup
+    try:
+        _geocode_location(location)
+    except Exception:
+        pass
+
 
-    if not WEATHER_API_KEY:
+def _get_weather(
+    location: str,
+    date: Union[str, Dict[str, Any], None],
+    time: Optional[Union[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Shared implementation of get_weather and get_weather_batch.
+    """
+    if not _get_api_key():
         return {"error": "GOOGLE_WEATHER_API env var is not set."}
 
     # --- 1) Normalize date/time input ---
@@ -135,92 +326,101 @@ def get_weather(
     if not date_str:
         return {"error": "Invalid or empty date input.", "raw_date": str(date)}
 
-    try:
-        target_date = datetime.fromisoformat(date_str).date()
-    except Exception as e:
+    target_date, target_hour = _parse_target(date_str, _as_str(time, _TIME_KEYS))
+    if target_date is None:
+        return {"error": f"Invalid date format: {date_str!r}, expected YYYY-MM-DD"}
+
+    # The API only covers ~10 days ahead; don't spend two requests finding out
+    days_ahead = (target_date - Date.today()).days
+    if days_ahead < 0 or days_ahead > 9:
         return {
-            "error": f"Invalid date format: {date_str!r}, expected YYYY-MM-DD",
-            "detail": str(e),
+            "error": "Date out of range; Weather API covers ~10 days ahead.",
+            "date": date_str,
+            "location": location,
         }
 
-    target_hour = _extract_hour(time)
+    # --- 2) Steps 2-5 are cached per (location, date, hour) ---
+    result = _weather_report(
+        _norm_loc(location),
+        target_date,
+        -1 if target_hour is None else target_hour,
+    )
+    return {"location": location, **result}
+
+
+def _out_of_range_error(date_str: str) -> str:
+    return (
+        f"No hourly forecast found for {date_str}. "
+        "Weather API typically covers only ~10 days ahead."
+    )
+
+
+@ttl_cache(ttl_seconds=WEATHER_RESULT_TTL_SECONDS, maxsize=256, cache_if=_is_success)
+def _hours_for_date(location: str, target_date: Date) -> Dict[str, Any]:
+    """
+    Geocode `location` and return {"lat", "lng", "hours"} with the forecast
+    hours of `target_date`, or an error dict.
+
+    Cached per (location, date), so asking for another time of the same day
+    only re-scores these ~24 hours.
+    """
+    date_str = target_date.isoformat()
+
+    # The horizon counts from now but delta_days uses the server's date, so
+    # one day of slack covers the target day's last hours at places west of
+    # the server. Two fixed horizons keep _fetch_forecast_by_date's cache
+    # shared between dates: today/tomorrow fetch 72 hours, later dates all 240.
+    delta_days = (target_date - Date.today()).days
+    hours_needed = SHORT_HORIZON_HOURS if delta_days <= 1 else 240
 
     # --- 2) Geocode the location ---
     try:
         coords = _geocode_location(location)
     except Exception as e:
-        return {
-            "error": f"Failed to geocode location: {str(e)}",
-            "location": location,
-        }
+        return {"error": f"Failed to geocode location: {str(e)}"}
 
     lat, lng = coords["lat"], coords["lng"]
 
-    # --- 3) Call Google Weather hourly forecast ---
-    weather_url = "https://weather.googleapis.com/v1/forecast/hours:lookup"
-    params = {
-        "key": WEATHER_API_KEY,
-        "location.latitude": lat,
-        "location.longitude": lng,
-        "hours": 240,      # up to ~10 days ahead
-        "pageSize": 240,   # avoid pagination
-    }
-    if units.upper() == "IMPERIAL":
-        params["unitsSystem"] = "IMPERIAL"
-
+    # --- 3) Call Google Weather hourly forecast (cached for a few minutes) ---
+    # Rounded so spellings that geocode a few metres apart share one forecast
     try:
-        resp = requests.get(weather_url, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
+        by_date = _fetch_forecast_by_date(
+            round(lat, COORD_DECIMALS), round(lng, COORD_DECIMALS), hours_needed
+        )
     except Exception as e:
-        return {
-            "error": f"Failed to fetch weather data: {str(e)}",
-            "location": location,
-        }
+        return {"error": f"Failed to fetch weather data: {str(e)}"}
 
-    hours_list = data.get("forecastHours", [])
-    if not hours_list:
-        return {
-            "error": "No forecastHours returned by Weather API.",
-            "location": location,
-        }
+    if not by_date:
+        return {"error": "No forecastHours returned by Weather API."}
 
-    # --- 4) Find the closest forecast hour for that date/time ---
-    best = None
-    best_score: Optional[int] = None
+    hours = by_date.get((target_date.year, target_date.month, target_date.day))
+    if not hours:
+        return {"error": _out_of_range_error(date_str), "date": date_str}
 
-    for fh in hours_list:
-        dd = fh.get("displayDateTime")
-        if not dd:
-            continue
+    return {"lat": lat, "lng": lng, "hours": hours}
 
-        fh_date = Date(dd["year"], dd["month"], dd["day"])
-        if fh_date != target_date:
-            continue
 
-        fh_hour = dd.get("hours")
-        if fh_hour is None:
-            continue
+@ttl_cache(ttl_seconds=WEATHER_RESULT_TTL_SECONDS, maxsize=512, cache_if=_is_success)
+def _weather_report(location: str, target_date: Date, target_hour: int) -> Dict[str, Any]:
+    """
+    Pick the forecast hour closest to `target_hour` (-1 for "middle of the
+    day") on `target_date` at `location`.
 
-        if target_hour is None:
-            # Middle of the day if no specific time requested
-            score = abs(fh_hour - 12)
-        else:
-            score = abs(fh_hour - target_hour)
+    Returns the get_weather payload without its "location" key, or an error
+    dict. Only successful payloads are cached.
+    """
+    date_str = target_date.isoformat()
 
-        if best is None or best_score is None or score < best_score:
-            best = fh
-            best_score = score
+    # --- 2-3) Geocode + hourly forecast for that date (cached per place/date) ---
+    day = _hours_for_date(location, target_date)
+    if "error" in day:
+        return day
+    lat, lng, candidates = day["lat"], day["lng"], day["hours"]
 
-    if best is None:
-        return {
-            "error": (
-                f"No hourly forecast found for {date_str} at {location}. "
-                "Weather API typically covers only ~10 days ahead."
-            ),
-            "location": location,
-            "date": date_str,
-        }
+    # --- 4) Find the closest forecast hour for that date/time ---
+    # Middle of the day if no specific time requested
+    wanted_hour = 12 if target_hour < 0 else target_hour
+    best = min(candidates, key=lambda fh: abs(fh["displayDateTime"]["hours"] - wanted_hour))
 
     # --- 5) Build a compact return payload ---
     dd = best.get("displayDateTime", {})
@@ -232,13 +432,11 @@ def get_weather(
     if "precipitation" in best and "probability" in best["precipitation"]:
         precip_prob = best["precipitation"]["probability"].get("percent")
 
-    result: Dict[str, Any] = {
-        "location": location,
+    result: WeatherResult = {
         "latitude": lat,
         "longitude": lng,
-        "date": f"{dd.get('year', target_date.year):04d}-"
-        f"{dd.get('month', target_date.month):02d}-"
-        f"{dd.get('day', target_date.day):02d}",
+        # The hour came from the target date's bucket, so this is its date
+        "date": date_str,
         "hour": dd.get("hours"),
         "utcOffset": dd.get("utcOffset"),
         "description": desc,